@@ -9,6 +9,10 @@ setup(
     install_requires=[
         "rich>=10.0.0",
     ],
+    extras_require={
+        # Faster content hashing for duplicate detection
+        "blake3": ["blake3>=0.4"],
+    },
     entry_points={
         "console_scripts": [
             "filetree=filetree.cli:main",
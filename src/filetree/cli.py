@@ -7,7 +7,6 @@ from .core.scanner import FileTreeScanner
 from .core.duplicates import DuplicateFinder
 from .utils.config import Config
 from .utils.report import ReportGenerator
-from .interactive import DuplicateResolver
 
 console = Console()
 
@@ -52,6 +51,11 @@ def parse_args(args=None) -> argparse.Namespace:
     )
     return parser.parse_args(args)
 
+def _handle_interrupt() -> int:
+    """Report a Ctrl+C from the user and return the conventional exit code."""
+    console.print("\n[yellow]Operation cancelled by user[/yellow]")
+    return 130
+
 def main(args=None) -> int:
     """Main entry point.
     
@@ -59,7 +63,7 @@ def main(args=None) -> int:
         args: Optional list of command line arguments. If None, sys.argv[1:] will be used.
     
     Returns:
-        int: Exit code (0 for success, 1 for error)
+        int: Exit code (0 for success, 1 for error, 130 if interrupted)
     """
     args = parse_args(args)
     directory = Path(args.directory)
@@ -83,7 +87,7 @@ def main(args=None) -> int:
         # Find duplicates
         console.print("[bold cyan]🔍 Analyzing duplicates...[/bold cyan]")
         duplicate_finder = DuplicateFinder(min_size=args.min_size)
-        duplicates = duplicate_finder.find_duplicates(files)
+        duplicates = duplicate_finder.find_duplicates(files, scanner.file_stats)
         
         # Generate and display report
         report_gen = ReportGenerator()
@@ -92,7 +96,10 @@ def main(args=None) -> int:
             files=files,
             duplicates=duplicates,
             config=config,
-            show_tree=not args.no_tree
+            show_tree=not args.no_tree,
+            file_stats=scanner.file_stats,
+            type_counts=scanner.type_counts,
+            duplicate_stats=duplicate_finder.get_duplicate_stats(duplicates)
         )
         
         try:
@@ -113,11 +120,15 @@ def main(args=None) -> int:
         
         # Start interactive mode if requested
         if args.interactive and duplicates:
+            # Imported here so non-interactive runs don't load the prompt UI
+            from .interactive import DuplicateResolver
             resolver = DuplicateResolver(duplicates)
             resolver.start_interactive_session()
         
         return 0
         
+    except KeyboardInterrupt:
+        return _handle_interrupt()
     except Exception as e:
         console.print(f"[red]Error: {str(e)}[/red]")
         return 1
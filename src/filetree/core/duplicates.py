@@ -1,19 +1,39 @@
 """Module for finding duplicate files."""
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 import hashlib
 import os
 
+# Read size for hashing: a multiple of SHA-256's 64-byte block so every
+# update() consumes whole blocks without buffering a partial tail.
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Files up to this size are compared by content directly; reading a single
+# block is cheaper than hashing every candidate.
+SMALL_FILE_SIZE = 4096
+
+# Digests only identify file contents, so hashing is flagged as not used
+# for security; OpenSSL builds in FIPS mode then allow SHA-256 without
+# their security checks. The flag needs Python 3.9 or later.
+try:
+    new_sha256 = partial(hashlib.sha256, usedforsecurity=False)
+    new_sha256()
+except TypeError:
+    new_sha256 = hashlib.sha256
+
 class DuplicateFinder:
     """Class for finding duplicate files."""
 
     def __init__(self, min_size: int = 1):
         """Initialize finder with minimum file size."""
         self.min_size = min_size
+        # File size of each duplicate group found by the last search
+        self.group_sizes: Dict[str, int] = {}
 
-    def _get_file_hash(self, file_path: Path, chunk_size: int = 8192) -> str:
+    def _get_file_hash(self, file_path: Path, chunk_size: int = HASH_CHUNK_SIZE) -> str:
         """Calculate SHA-256 hash of a file."""
-        sha256_hash = hashlib.sha256()
+        sha256_hash = new_sha256()
         try:
             with open(file_path, "rb") as f:
                 for chunk in iter(lambda: f.read(chunk_size), b""):
@@ -22,6 +42,14 @@ class DuplicateFinder:
         except (OSError, PermissionError) as e:
             raise Exception(f"Error reading file {file_path}: {str(e)}")
 
+    def _read_small_file(self, file_path: Path) -> bytes:
+        """Read the full contents of a small file."""
+        try:
+            with open(file_path, "rb") as f:
+                return f.read()
+        except (OSError, PermissionError) as e:
+            raise Exception(f"Error reading file {file_path}: {str(e)}")
+
     def _get_file_size(self, file_path: Path) -> int:
         """Get size of a file."""
         try:
@@ -29,13 +57,25 @@ class DuplicateFinder:
         except (OSError, PermissionError) as e:
             raise Exception(f"Error getting size of file {file_path}: {str(e)}")
 
-    def find_duplicates(self, files: List[Path]) -> Dict[str, List[Path]]:
-        """Find duplicate files in the given list."""
+    def find_duplicates(
+        self,
+        files: List[Path],
+        file_stats: Optional[Dict[Path, os.stat_result]] = None
+    ) -> Dict[str, List[Path]]:
+        """Find duplicate files in the given list.
+
+        ``file_stats`` may hold stat results captured while scanning (see
+        ``FileTreeScanner.file_stats``); files found there are not stat'ed
+        again. The size shared by the files of each group is kept in
+        ``group_sizes``.
+        """
+        file_stats = file_stats or {}
         # Group files by size first
         size_groups: Dict[int, List[Path]] = {}
         for file in files:
             try:
-                size = self._get_file_size(file)
+                cached = file_stats.get(file)
+                size = cached.st_size if cached is not None else self._get_file_size(file)
                 if size >= self.min_size:
                     if size not in size_groups:
                         size_groups[size] = []
@@ -45,41 +85,70 @@ class DuplicateFinder:
 
         # For each size group, calculate hashes
         duplicates: Dict[str, List[Path]] = {}
-        for size_group in size_groups.values():
+        group_sizes: Dict[str, int] = {}
+        for size, size_group in size_groups.items():
             if len(size_group) < 2:
                 continue
 
-            # Group files by hash
-            hash_groups: Dict[str, List[Path]] = {}
-            for file in size_group:
-                try:
-                    file_hash = self._get_file_hash(file)
-                    if file_hash not in hash_groups:
-                        hash_groups[file_hash] = []
-                    hash_groups[file_hash].append(file)
-                except Exception:
-                    continue
+            if size <= SMALL_FILE_SIZE:
+                # Group small files by their contents and hash each
+                # distinct content once instead of every file
+                content_groups: Dict[bytes, List[Path]] = {}
+                for file in size_group:
+                    try:
+                        content = self._read_small_file(file)
+                        if content not in content_groups:
+                            content_groups[content] = []
+                        content_groups[content].append(file)
+                    except Exception:
+                        continue
+
+                hash_groups = {
+                    new_sha256(content).hexdigest(): files
+                    for content, files in content_groups.items()
+                    if len(files) > 1
+                }
+            else:
+                # Group files by hash
+                hash_groups: Dict[str, List[Path]] = {}
+                for file in size_group:
+                    try:
+                        file_hash = self._get_file_hash(file)
+                        if file_hash not in hash_groups:
+                            hash_groups[file_hash] = []
+                        hash_groups[file_hash].append(file)
+                    except Exception:
+                        continue
 
             # Add groups with duplicates to results
             for hash_value, files in hash_groups.items():
                 if len(files) > 1:
                     duplicates[hash_value] = files
+                    group_sizes[hash_value] = size
+
+        self.group_sizes = group_sizes
 
         return duplicates
 
     def get_duplicate_stats(self, duplicates: Dict[str, List[Path]]) -> Dict[str, int]:
-        """Get statistics about duplicate files."""
+        """Get statistics about duplicate files.
+
+        Group sizes known from the last ``find_duplicates`` call are reused;
+        other groups are sized from their first file.
+        """
         stats = {
             'total_groups': len(duplicates),
             'total_duplicates': 0,
             'wasted_space': 0
         }
 
-        for files in duplicates.values():
+        for hash_value, files in duplicates.items():
             if not files:
                 continue
             try:
-                file_size = self._get_file_size(files[0])
+                file_size = self.group_sizes.get(hash_value)
+                if file_size is None:
+                    file_size = self._get_file_size(files[0])
                 num_duplicates = len(files) - 1
                 stats['total_duplicates'] += num_duplicates
                 stats['wasted_space'] += file_size * num_duplicates
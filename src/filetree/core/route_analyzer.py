@@ -1,7 +1,10 @@
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterator, List, Set, Tuple
 from collections import defaultdict
 import difflib
+import math
+import operator
+import os
 
 class RouteAnalyzer:
     """Analyze directory routes for similarity."""
@@ -14,36 +17,127 @@ class RouteAnalyzer:
 
     def find_similar_routes(self) -> List[Tuple[str, str, float]]:
         """Find similar directory routes based on path similarity."""
-        self.routes = [
-            str(p.relative_to(self.root_path))
-            for p in self.root_path.rglob("*")
-            if p.is_dir()
-        ]
+        self.routes = list(self._iter_routes())
+        # Split every route once instead of once per pair compared
+        tokens = self._tokenize_routes(self.routes)
 
         similar_routes = []
-        for i, route1 in enumerate(self.routes):
-            for route2 in self.routes[i + 1:]:
-                similarity = self._compute_similarity(route1, route2)
-                if similarity >= self.similarity_threshold:
-                    similar_routes.append((route1, route2, similarity))
+        for i, j in self._candidate_pairs(tokens):
+            similarity = self._component_similarity(tokens[i], tokens[j])
+            if similarity >= self.similarity_threshold:
+                similar_routes.append((self.routes[i], self.routes[j], similarity))
 
         return similar_routes
 
-    def _compute_similarity(self, path1: str, path2: str) -> float:
-        """Compute similarity between two paths using Levenshtein distance."""
-        if not path1 or not path2:
-            return 0.0
+    def _candidate_pairs(self, tokens: List[Tuple[int, ...]]) -> List[Tuple[int, int]]:
+        """Return the index pairs (i < j) of routes that can meet the threshold.
+
+        Two routes reach similarity t only if at least ceil(t * n) of the n
+        components of either one match the other at the same position. So
+        with each route's (position, component) pairs ordered rarest first,
+        any such pair of routes shares one of the first n - ceil(t * n) + 1
+        of them (prefix filtering). Only routes sharing one of those are
+        compared, which skips the mostly unrelated pairs without missing
+        any match. The pairs are returned in the order of a full pairwise
+        sweep.
+        """
+        count = len(tokens)
+        threshold = self.similarity_threshold
+        if threshold <= 0:
+            return [(i, j) for i in range(count) for j in range(i + 1, count)]
 
+        keyed = [list(enumerate(parts)) for parts in tokens]
+        frequency: Dict[Tuple[int, int], int] = defaultdict(int)
+        for keys in keyed:
+            for key in keys:
+                frequency[key] += 1
+
+        index: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        pairs = []
+        for i, keys in enumerate(keyed):
+            # The small tolerance keeps float rounding from shortening the
+            # prefix; a longer prefix only adds candidates
+            required = max(1, math.ceil(threshold * len(keys) - 1e-9))
+            keys.sort(key=lambda key: (frequency[key], key))
+            candidates = set()
+            for key in keys[:len(keys) - required + 1]:
+                bucket = index[key]
+                candidates.update(bucket)
+                bucket.append(i)
+            pairs.extend((j, i) for j in candidates)
+
+        pairs.sort()
+        return pairs
+
+    @staticmethod
+    def _split_route(route: str) -> List[str]:
+        """Split a route into its components, accepting either separator."""
         # Convert Windows path separators to Unix style for consistency
-        path1 = path1.replace("\\", "/")
-        path2 = path2.replace("\\", "/")
+        return route.replace("\\", "/").split("/")
 
-        # Split paths into components
-        parts1 = path1.split("/")
-        parts2 = path2.split("/")
+    def _tokenize_routes(self, routes: List[str]) -> List[Tuple[int, ...]]:
+        """Split routes into components, with each distinct name mapped to an int.
 
-        # Compare path components
-        matches = sum(1 for a, b in zip(parts1, parts2) if a == b)
-        total = max(len(parts1), len(parts2))
+        Equal components get equal ints, so comparing tokens is the same as
+        comparing the names, but cheaper.
+        """
+        interner: Dict[str, int] = {}
+        return [
+            tuple(interner.setdefault(part, len(interner)) for part in self._split_route(route))
+            for route in routes
+        ]
+
+    @staticmethod
+    def _component_similarity(parts1: Tuple, parts2: Tuple) -> float:
+        """Compute the similarity of two non-empty component sequences."""
+        # Compare path components position by position; map() stops at the
+        # shorter path like zip() and counts matches without a Python loop
+        matches = sum(map(operator.eq, parts1, parts2))
+        return matches / max(len(parts1), len(parts2))
+
+    def _iter_routes(self) -> Iterator[str]:
+        """Yield every directory below the root as a relative path.
+
+        Uses os.scandir so files are skipped on their directory entry type
+        without building a Path or calling stat() for each one. Symlinked
+        directories are reported but not descended into, as with rglob.
+        A directory's subdirectories are yielded in name order before any
+        of them is descended into, so the order doesn't depend on scandir.
+        """
+        stack = [("", str(self.root_path))]
+        while stack:
+            prefix, directory = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                subdirs.append((entry.name, entry.path, entry.is_symlink()))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            subdirs.sort()
+            for name, path, is_symlink in subdirs:
+                yield prefix + name
+            # Pushed in reverse so the first subdirectory is descended into first
+            stack.extend(
+                (prefix + name + os.sep, path)
+                for name, path, is_symlink in reversed(subdirs) if not is_symlink
+            )
+
+    def _compute_similarity(self, path1: str, path2: str) -> float:
+        """Compute similarity between two paths.
+
+        The similarity is the number of components that match at the same
+        position, divided by the component count of the longer path.
+        """
+        if not path1 or not path2:
+            return 0.0
+        if path1 == path2:
+            return 1.0
 
-        return matches / total if total > 0 else 0.0
\ No newline at end of file
+        return self._component_similarity(
+            self._split_route(path1), self._split_route(path2)
+        )
\ No newline at end of file
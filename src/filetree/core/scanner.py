@@ -1,106 +1,306 @@
 """File system scanner module."""
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import Callable, List, Dict, Optional, Set, Tuple
 import os
-from fnmatch import fnmatch
+import re
+from fnmatch import translate
 
 from ..utils.config import Config
 
+# Characters that make a pattern a glob rather than a literal name
+_GLOB_CHARS = re.compile(r"[*?[]")
+
+@lru_cache(maxsize=32)
+def _compile_ignore_patterns(patterns: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Build a function telling whether a name matches any of the glob patterns.
+
+    Most ignore patterns are literal names ("node_modules") or a star
+    followed by a literal suffix ("*.pyc"). Those are matched with one set
+    lookup and one str.endswith call; only the remaining globs are combined
+    into a single regex. Like fnmatch, matching is case-insensitive on
+    Windows. The result is cached per tuple of patterns, so repeated scans
+    with the same configuration build it only once, while patterns changed
+    between scans still take effect.
+    """
+    ignore_case = os.name == "nt"
+    names = set()
+    suffixes = []
+    globs = []
+    for pattern in patterns:
+        if ignore_case:
+            pattern = pattern.lower()
+        if not _GLOB_CHARS.search(pattern):
+            names.add(pattern)
+        elif pattern.startswith("*") and not _GLOB_CHARS.search(pattern, 1):
+            suffixes.append(pattern[1:])
+        else:
+            globs.append(pattern)
+
+    names = frozenset(names)
+    suffixes = tuple(suffixes)
+    glob_match = None
+    if globs:
+        combined = "|".join(f"(?:{translate(pattern)})" for pattern in globs)
+        glob_match = re.compile(combined).match
+
+    def ignore_match(name: str) -> bool:
+        if ignore_case:
+            name = name.lower()
+        return (
+            name in names
+            or name.endswith(suffixes)
+            or (glob_match is not None and glob_match(name) is not None)
+        )
+
+    return ignore_match
+
+# Threads listing directories in parallel; beyond a few, they contend for
+# the same filesystem locks instead of overlapping waits. Listing waits on
+# the filesystem rather than the CPU, so the count does not depend on the
+# CPUs available; 1 lists directories one after another.
+SCAN_WORKERS = 4
+
+# Kept files as (path, name, stat result or None when files are not
+# stat'ed), and subdirectories to descend into
+_Listing = Tuple[List[Tuple[str, str, Optional[os.stat_result]]], List[str]]
+
+_path_name = attrgetter("name")
+
+def _name_suffix(name: str) -> str:
+    """Get the extension of a file name, as ``Path(name).suffix`` would."""
+    i = name.rfind('.')
+    return name[i:] if 0 < i < len(name) - 1 else ''
+
+def _fold_suffix_counts(suffix_counts: Counter) -> Counter:
+    """Merge counts of raw suffixes into counts per lower-case file type.
+
+    Each distinct suffix is folded once instead of once per file; types
+    keep the order in which they were first seen.
+    """
+    type_counts: Counter = Counter()
+    for suffix, count in suffix_counts.items():
+        type_counts[suffix.lower() or '(no extension)'] += count
+    return type_counts
+
 class FileTreeScanner:
     """Scanner for analyzing directory structure."""
 
     def __init__(self, config: Config):
         """Initialize scanner with configuration."""
         self.config = config
+        # stat results of the files found by the last scan; a cache, so
+        # its readers stat any file missing from it
+        self.file_stats: Dict[Path, os.stat_result] = {}
+        # extension histogram of the files found by the last scan
+        self.type_counts: Counter = Counter()
+        # files found by the last scan, by directory relative to its root
+        self.directory_structure: Dict[str, Set[Path]] = {}
+
+    def scan_directory(self, directory: Path, stat_files: bool = True) -> List[Path]:
+        """Scan directory and return list of files.
 
-    def scan_directory(self, directory: Path) -> List[Path]:
-        """Scan directory and return list of files."""
+        The stat result of every returned file is kept in ``file_stats``,
+        the count of files per extension in ``type_counts`` and the files
+        grouped by directory in ``directory_structure``. Callers that need
+        no file sizes can pass ``stat_files=False`` to skip the stat call
+        per file; ``file_stats`` is then left empty. Its readers
+        (``get_file_stats``, ``DuplicateFinder.find_duplicates``
+        and ``ReportGenerator.generate_report``) stat files missing from it.
+        """
         if not directory.exists():
             raise Exception(f"Error scanning directory {directory}: Directory does not exist")
             
+        # Resolve configuration once per scan instead of once per entry
+        ignore_match = _compile_ignore_patterns(tuple(self.config.ignore_patterns))
+        include_hidden = self.config.include_hidden
+        follow_symlinks = self.config.follow_symlinks
+
         files = []
+        file_stats: Dict[Path, os.stat_result] = {}
+        suffix_counts: Counter = Counter()
+        structure: Dict[str, Set[Path]] = {}
+        # The scanned directory's own name is checked once up front; every
+        # subdirectory is checked once where it is listed
+        skip_root_files = ignore_match(directory.name) or (
+            not include_hidden and directory.name.startswith('.')
+        )
+
+        list_directory = partial(
+            self._list_directory,
+            ignore_match=ignore_match,
+            include_hidden=include_hidden,
+            follow_symlinks=follow_symlinks,
+            stat_files=stat_files,
+        )
+        root = str(directory)
+        if SCAN_WORKERS > 1:
+            listings = self._list_tree_parallel(
+                root, skip_root_files, list_directory, SCAN_WORKERS
+            )
+        else:
+            listings = self._list_tree(root, skip_root_files, list_directory)
+
+        # Collect the listings depth-first, in the order of a top-down os.walk
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            dir_files, subdirs = listings[current]
+            if dir_files:
+                dir_set = structure[os.path.relpath(current, root)] = set()
+            for path, name, file_stat in dir_files:
+                # Path objects are only built for the files returned; the
+                # extension comes straight from the entry name
+                file_path = Path(path)
+                files.append(file_path)
+                if file_stat is not None:
+                    file_stats[file_path] = file_stat
+                suffix_counts[_name_suffix(name)] += 1
+                dir_set.add(file_path)
+            stack.extend(reversed(subdirs))
+
+        self.file_stats = file_stats
+        self.type_counts = _fold_suffix_counts(suffix_counts)
+        self.directory_structure = structure
+            
+        return files
+
+    @staticmethod
+    def _list_directory(
+        directory: str,
+        skip_files: bool,
+        ignore_match: Callable[[str], bool],
+        include_hidden: bool,
+        follow_symlinks: bool,
+        stat_files: bool = True
+    ) -> _Listing:
+        """List one directory's kept files and subdirectories; empty if unreadable."""
+        dir_files = []
+        subdirs = []
         try:
-            for root, _, filenames in os.walk(directory):
-                root_path = Path(root)
-                
-                # Skip ignored directories
-                if any(fnmatch(root_path.name, pattern) for pattern in self.config.ignore_patterns):
-                    continue
-                
-                # Skip hidden directories if configured
-                if not self.config.include_hidden and root_path.name.startswith('.'):
-                    continue
-                
-                for filename in filenames:
-                    file_path = root_path / filename
-                    
-                    # Skip ignored files
-                    if any(fnmatch(filename, pattern) for pattern in self.config.ignore_patterns):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # Skip ignored and hidden entries before any syscall
+                    if ignore_match(name):
                         continue
-                    
-                    # Skip hidden files if configured
-                    if not self.config.include_hidden and filename.startswith('.'):
+                    if not include_hidden and name.startswith('.'):
                         continue
-                    
-                    # Skip symlinks if configured
-                    if not self.config.follow_symlinks and file_path.is_symlink():
-                        continue
-                        
+
                     try:
+                        # Symlinks are skipped if configured before their
+                        # target is stat'ed to tell directories from files
+                        is_symlink = entry.is_symlink()
+                        if is_symlink and not follow_symlinks:
+                            continue
+                        if entry.is_dir():
+                            # Symlinked directories are not descended into
+                            if not is_symlink:
+                                subdirs.append(entry.path)
+                            continue
+                        if skip_files:
+                            continue
+
+                        # The lstat result is kept as the file's stat for
+                        # regular files
+                        if not stat_files:
+                            file_stat = None
+                        elif is_symlink:
+                            file_stat = entry.stat()
+                        else:
+                            file_stat = entry.stat(follow_symlinks=False)
+
                         # Skip files that can't be accessed
-                        if not os.access(file_path, os.R_OK):
+                        if not os.access(entry.path, os.R_OK):
                             continue
-                            
-                        files.append(file_path)
                     except (PermissionError, OSError):
                         continue
-                        
-        except (PermissionError, OSError) as e:
-            raise Exception(f"Error scanning directory {directory}: {str(e)}")
-            
-        return files
+
+                    dir_files.append((entry.path, name, file_stat))
+        except (PermissionError, OSError):
+            pass
+        return dir_files, subdirs
+
+    @staticmethod
+    def _list_tree(
+        root: str, skip_root_files: bool, list_directory: Callable[[str, bool], _Listing]
+    ) -> Dict[str, _Listing]:
+        """List every directory of a tree, one after another."""
+        listings = {}
+        pending = [(root, skip_root_files)]
+        while pending:
+            directory, skip_files = pending.pop()
+            listings[directory] = listing = list_directory(directory, skip_files)
+            pending.extend((subdir, False) for subdir in listing[1])
+        return listings
+
+    @staticmethod
+    def _list_tree_parallel(
+        root: str,
+        skip_root_files: bool,
+        list_directory: Callable[[str, bool], _Listing],
+        workers: int
+    ) -> Dict[str, _Listing]:
+        """List every directory of a tree with a small pool of threads.
+
+        Listing a directory mostly waits on the filesystem, so a few
+        threads overlap those waits; subdirectories are queued as soon as
+        their parent is listed.
+        """
+        listings = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(list_directory, root, skip_root_files): root}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    listings[pending.pop(future)] = listing = future.result()
+                    for subdir in listing[1]:
+                        pending[pool.submit(list_directory, subdir, False)] = subdir
+        return listings
 
     def get_file_stats(self, files: List[Path]) -> Dict[str, int]:
         """Get statistics about files."""
-        stats = {
-            'total_files': len(files),
-            'total_size': 0,
-            'min_size': float('inf'),
-            'max_size': 0
-        }
-        
+        total_size = 0
+        min_size = float('inf')
+        max_size = 0
+        file_stats = self.file_stats
+
         for file in files:
             try:
-                size = os.path.getsize(file)
-                stats['total_size'] += size
-                stats['min_size'] = min(stats['min_size'], size)
-                stats['max_size'] = max(stats['max_size'], size)
+                # Files from the last scan reuse its stat result
+                cached = file_stats.get(file)
+                size = cached.st_size if cached else os.path.getsize(file)
             except (OSError, PermissionError):
                 continue
-                
-        if not files:
-            stats['min_size'] = 0
-            
-        return stats
+            total_size += size
+            if size < min_size:
+                min_size = size
+            if size > max_size:
+                max_size = size
 
-    def get_file_types(self, files: List[Path]) -> Dict[str, int]:
+        return {
+            'total_files': len(files),
+            'total_size': total_size,
+            'min_size': min_size if files else 0,
+            'max_size': max_size
+        }
+
+    @staticmethod
+    def get_file_types(files: List[Path]) -> Dict[str, int]:
         """Get distribution of file types."""
-        extensions = {}
-        
-        for file in files:
-            ext = file.suffix.lower() or '(no extension)'
-            extensions[ext] = extensions.get(ext, 0) + 1
-            
-        return dict(sorted(extensions.items(), key=lambda x: x[1], reverse=True))
+        extensions = _fold_suffix_counts(Counter(map(_name_suffix, map(_path_name, files))))
+        # most_common() sorts by count, keeping first-seen order for ties
+        return dict(extensions.most_common())
 
     def get_directory_structure(self, directory: Path) -> Dict[str, Set[Path]]:
-        """Get structure of directories and their files."""
-        structure = {}
-        
-        for file in self.scan_directory(directory):
-            dir_path = str(file.parent.relative_to(directory))
-            if dir_path not in structure:
-                structure[dir_path] = set()
-            structure[dir_path].add(file)
-            
-        return structure
\ No newline at end of file
+        """Get structure of directories and their files.
+
+        Scans the directory without stat'ing its files; callers that
+        already scanned it can read ``directory_structure`` instead of
+        walking the tree again.
+        """
+        self.scan_directory(directory, stat_files=False)
+        return self.directory_structure
\ No newline at end of file
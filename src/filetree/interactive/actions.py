@@ -122,22 +122,26 @@ class DirectoryManager(FileAction):
             # Create target directory if it doesn't exist
             target.mkdir(parents=True, exist_ok=True)
             
-            # Move all contents from source to target
-            for item in source.iterdir():
+            # Move all contents from source to target, listed before any move
+            with os.scandir(source) as it:
+                items = list(it)
+            for item in items:
                 dest = target / item.name
                 if dest.exists():
                     if item.is_dir():
-                        self.merge_directories(item, dest)
+                        self.merge_directories(Path(item.path), dest)
                     else:
                         if self.confirm_action(
                             f"{dest} already exists. Overwrite?"
                         ):
-                            shutil.move(str(item), str(dest))
+                            shutil.move(item.path, str(dest))
                 else:
-                    shutil.move(str(item), str(dest))
+                    shutil.move(item.path, str(dest))
             
             # Remove empty source directory
-            if not any(source.iterdir()):
+            with os.scandir(source) as it:
+                is_empty = next(it, None) is None
+            if is_empty:
                 source.rmdir()
                 console.print(f"[green]Successfully merged[/green] {source} into {target}")
         
@@ -1,118 +1,556 @@
 """Parallel processing utilities for file tree operations."""
 import os
+import sys
+import stat
+import mmap
+import socket
 import hashlib
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import multiprocessing
+from array import array
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Callable, Any, Iterator, Tuple, Set, Union
+from typing import List, Dict, Callable, Any, BinaryIO, Iterable, Iterator, Tuple, Set, Union, Optional
 from .env import env_config
-from collections import defaultdict
+from ..core.duplicates import HASH_CHUNK_SIZE, new_sha256
+
+try:
+    import blake3
+except ImportError:  # optional, installed with the "blake3" extra
+    blake3 = None
 
 logger = logging.getLogger(__name__)
 
-def compute_file_hash(file_path: Path) -> str:
-    """Compute SHA256 hash of a file in chunks."""
-    if not file_path.is_file():
-        logger.error(f"File not found: {file_path}")
-        return ""
+# Digests of zero bytes, so empty files are hashed without being opened
+_EMPTY_DIGESTS = {"sha256": new_sha256().digest()}
+if blake3 is not None:
+    _EMPTY_DIGESTS["blake3"] = blake3.blake3().digest()
+
+# Files at least this large are hashed by the kernel's crypto API when it
+# is available, and through a memory map otherwise; below it the extra
+# syscalls cost more than the copy saved.
+LARGE_FILE_SIZE = 1 << 20
+
+# Files handed to a hashing worker per task, so the executor's per-task
+# overhead is paid once per batch rather than once per file.
+HASH_BATCH_SIZE = 8
+
+# Bytes read from each end of a large candidate to rule it out before
+# hashing; files up to HASH_CHUNK_SIZE take a single read to hash anyway.
+SAMPLE_SIZE = 4096
+
+# Duplicate candidates needed before they are hashed in worker processes
+# instead of threads; below it forking the pool costs more than the GIL.
+PROCESS_HASH_MIN_FILES = 512
+
+# CPUs this process may run on; unlike os.cpu_count() this honors CPU
+# affinity, as set for containers and by taskset.
+_AVAILABLE_CPUS = (
+    len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity")
+    else os.cpu_count() or 1
+)
+
+# Flags for reading a file through a raw descriptor; O_BINARY keeps
+# Windows from translating line endings
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# Hashing threads mostly wait on I/O, so twice as many as CPUs
+_DEFAULT_WORKERS = min(32, _AVAILABLE_CPUS * 2)
+
+_kernel_hash_available = (
+    sys.platform == "linux"
+    and hasattr(socket, "AF_ALG")
+    and hasattr(os, "splice")
+)
+
+def _kernel_file_digest(fd: int, size: int) -> Optional[bytes]:
+    """Compute the SHA256 digest of an open file with the kernel's AF_ALG API.
+
+    File pages are spliced through a pipe into the hash socket, so the data
+    never gets copied into user space. Returns None if the kernel interface
+    is unusable; it is then not tried again for the rest of the process.
+    """
+    global _kernel_hash_available
+    try:
+        with socket.socket(socket.AF_ALG, socket.SOCK_SEQPACKET, 0) as alg:
+            alg.bind(("hash", "sha256"))
+            op, _ = alg.accept()
+            with op:
+                read_end, write_end = os.pipe()
+                try:
+                    offset = 0
+                    while offset < size:
+                        moved = os.splice(
+                            fd, write_end, min(HASH_CHUNK_SIZE, size - offset),
+                            offset_src=offset
+                        )
+                        if not moved:
+                            break
+                        offset += moved
+                        while moved:
+                            moved -= os.splice(
+                                read_end, op.fileno(), moved, flags=os.SPLICE_F_MORE
+                            )
+                finally:
+                    os.close(read_end)
+                    os.close(write_end)
+                # Receiving the digest finalizes the hash
+                return op.recv(32)
+    except OSError as e:
+        logger.debug("Kernel hashing unavailable, falling back to hashlib: %s", e)
+        _kernel_hash_available = False
+        return None
+
+def _file_digest(f: BinaryIO) -> bytes:
+    """Compute the SHA256 digest of an open unbuffered binary file.
+
+    Uses hashlib.file_digest where available (Python 3.11+), which runs the
+    whole read and hash loop in C. Otherwise one buffer is reused for every
+    read, so no chunk objects are allocated.
+    """
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, new_sha256).digest()
+    sha256_hash = new_sha256()
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    for size in iter(lambda: f.readinto(buffer), 0):
+        sha256_hash.update(view[:size])
+    return sha256_hash.digest()
+
+def _advise_sequential(fd: int) -> None:
+    """Tell the kernel an open file is about to be read once, front to back.
+
+    This widens readahead and starts it before the first read. Files that
+    fit in a single read gain nothing from it, so callers skip them.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+def _mmap_digest(fd: int) -> Optional[bytes]:
+    """Compute the SHA256 digest of an open file through a memory map.
 
+    The whole mapping is hashed in one call, without copying the file into
+    read buffers. Returns None if the file can't be mapped.
+    """
     try:
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-        hash_value = sha256_hash.hexdigest()
-        logger.debug(f"Hash computed for {file_path}: {hash_value[:8]}...")
-        return hash_value
-    except Exception as e:
-        logger.error(f"Error computing hash for {file_path}: {e}")
-        return ""
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return new_sha256(mapped).digest()
+    except (OSError, ValueError) as e:
+        logger.debug("Cannot memory-map file, reading it instead: %s", e)
+        return None
+
+def _blake3_digest(f: BinaryIO, size: int) -> bytes:
+    """Compute the BLAKE3 digest of an open unbuffered binary file.
+
+    Large files are memory-mapped and hashed by BLAKE3's own thread pool;
+    smaller ones are read in one call.
+    """
+    if size >= LARGE_FILE_SIZE:
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(f.name)
+    else:
+        hasher = blake3.blake3(f.read())
+    return hasher.digest()
+
+def _small_file_digest(path: str) -> Optional[bytes]:
+    """Compute the SHA256 digest of a file of at most HASH_CHUNK_SIZE bytes.
+
+    The file is read with a single os.read on a raw descriptor, skipping
+    the file object, fstat and readahead advice of the general path; the
+    GIL is released for the open, the read and the hash. Returns None if
+    the file turns out to be larger than one chunk.
+    """
+    fd = os.open(path, _READ_FLAGS)
+    try:
+        data = os.read(fd, HASH_CHUNK_SIZE + 1)
+        if len(data) > HASH_CHUNK_SIZE or os.read(fd, 1):
+            return None
+    finally:
+        os.close(fd)
+    return new_sha256(data).digest()
+
+def _read_samples(path: Union[str, Path], size: int) -> bytes:
+    """Read the first and last SAMPLE_SIZE bytes of a file of size bytes."""
+    fd = os.open(path, _READ_FLAGS)
+    try:
+        return os.pread(fd, SAMPLE_SIZE, 0) + os.pread(fd, SAMPLE_SIZE, size - SAMPLE_SIZE)
+    finally:
+        os.close(fd)
+
+# Digests by path, algorithm, device, inode, modification time and size,
+# least recently used first; a file is hashed again once it is modified
+# or replaced.
+_HASH_CACHE_SIZE = 65536
+_hash_cache: "OrderedDict[Tuple[str, str, int, int, int, int], bytes]" = OrderedDict()
+_hash_cache_lock = threading.Lock()
+
+def _hash_file(path: str, algorithm: str, file_size: int) -> bytes:
+    """Hash a file of file_size bytes; errors propagate, so failed reads are never cached."""
+    if file_size == 0:
+        return _EMPTY_DIGESTS[algorithm]
+    if algorithm == "sha256" and file_size <= HASH_CHUNK_SIZE:
+        hash_value = _small_file_digest(path)
+        if hash_value is not None:
+            return hash_value
+    # Unbuffered, so reads go straight into the hashing buffer
+    with open(path, "rb", buffering=0) as f:
+        hash_value = None
+        size = os.fstat(f.fileno()).st_size
+        if size > HASH_CHUNK_SIZE:
+            _advise_sequential(f.fileno())
+        if algorithm == "blake3":
+            hash_value = _blake3_digest(f, size)
+        elif size >= LARGE_FILE_SIZE:
+            if _kernel_hash_available:
+                hash_value = _kernel_file_digest(f.fileno(), size)
+            if hash_value is None:
+                hash_value = _mmap_digest(f.fileno())
+        if hash_value is None:
+            hash_value = _file_digest(f)
+    return hash_value
+
+def _cache_hash(key: Tuple[str, str, int, int, int, int], hash_value: bytes) -> None:
+    """Store a digest in the cache, evicting the least recently used one."""
+    with _hash_cache_lock:
+        _hash_cache[key] = hash_value
+        _hash_cache.move_to_end(key)
+        if len(_hash_cache) > _HASH_CACHE_SIZE:
+            _hash_cache.popitem(last=False)
+
+def _keyed_file_hash(
+    file_path: Union[str, Path], algorithm: str = "sha256"
+) -> Tuple[Optional[Tuple[str, str, int, int, int, int]], bytes]:
+    """Hash a file, returning its cache key along with the digest.
+
+    Worker processes return the key so their digests can be cached in the
+    parent. The key is None, and the digest empty, if the file can't be
+    hashed.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        logger.error(f"File not found: {file_path}")
+        return None, b""
+
+    key = (os.fspath(file_path), algorithm, st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    with _hash_cache_lock:
+        hash_value = _hash_cache.get(key)
+        if hash_value is not None:
+            _hash_cache.move_to_end(key)
+    if hash_value is None:
+        try:
+            hash_value = _hash_file(key[0], algorithm, st.st_size)
+        except Exception as e:
+            logger.error(f"Error computing hash for {file_path}: {e}")
+            return None, b""
+        _cache_hash(key, hash_value)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Hash computed for %s: %s...", file_path, hash_value[:4].hex())
+    return key, hash_value
+
+def compute_file_hash(file_path: Union[str, Path], algorithm: str = "sha256") -> bytes:
+    """Compute the raw digest of a file in chunks.
+
+    ``algorithm`` is "sha256" or, when the blake3 package is installed,
+    "blake3". The 32-byte digest is returned as-is; call ``.hex()`` on it
+    when a printable form is needed. Digests are cached by file identity,
+    modification time and size, so unchanged files are not read again;
+    ``compute_file_hash.cache_clear()`` empties the cache.
+    """
+    return _keyed_file_hash(file_path, algorithm)[1]
+
+compute_file_hash.cache_clear = _hash_cache.clear
 
 class ParallelProcessor:
     """Handles parallel processing of files."""
 
-    def __init__(self, num_workers: int = None):
-        """Initialize the processor with the specified number of workers."""
-        self.num_workers = num_workers or min(32, os.cpu_count() * 2)
-        logger.debug("Initialized ParallelProcessor with %d workers", self.num_workers)
+    def __init__(self, num_workers: int = None, hash_algorithm: Optional[str] = None):
+        """Initialize the processor with the specified number of workers.
+
+        Duplicates only need a collision-resistant digest, so files are
+        hashed with BLAKE3 when the blake3 package is installed and with
+        SHA-256 otherwise, unless ``hash_algorithm`` picks one.
+        """
+        self.num_workers = num_workers or _DEFAULT_WORKERS
+        if hash_algorithm is None:
+            hash_algorithm = "sha256" if blake3 is None else "blake3"
+        if hash_algorithm not in ("sha256", "blake3"):
+            raise ValueError(f"Unsupported hash algorithm: {hash_algorithm}")
+        if hash_algorithm == "blake3" and blake3 is None:
+            raise ValueError("The blake3 hash algorithm requires the blake3 package")
+        self.hash_algorithm = hash_algorithm
+        logger.debug(
+            "Initialized ParallelProcessor with %d workers using %s",
+            self.num_workers, self.hash_algorithm
+        )
+
+    def compute_file_hash(self, file_path: Union[str, Path]) -> bytes:
+        """Compute the raw digest of a file with the processor's algorithm."""
+        return compute_file_hash(file_path, self.hash_algorithm)
+
+    def _hash_entry(self, file_path: Union[str, Path]) -> Tuple[Union[str, Path], bytes]:
+        """Hash a file and return it paired with its path."""
+        return file_path, self.compute_file_hash(file_path)
+
+    def _hash_batch(
+        self, file_paths: List[Union[str, Path]]
+    ) -> List[Tuple[Union[str, Path], bytes]]:
+        """Hash a batch of files and return each paired with its path."""
+        return [self._hash_entry(file_path) for file_path in file_paths]
 
-    def compute_file_hash(self, file_path: Path) -> str:
-        """Compute SHA-256 hash of a file."""
+    def _walk_files(self, directory: Path) -> Iterator[str]:
+        """Yield the path strings of files under a directory, depth first."""
+        stack = [str(directory)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                yield entry.path
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.debug("Skipping directory %s: %s", current, e)
+
+    def iter_files(self, directory: Path) -> Iterator[Path]:
+        """Yield the files under a directory as the scan discovers them."""
+        paths = self._walk_files(directory)
         try:
-            hasher = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b''):
-                    hasher.update(chunk)
-            file_hash = hasher.hexdigest()
-            logger.debug("Hash computed for %s: %s...", file_path, file_hash[:8])
-            return file_hash
-        except Exception as e:
-            logger.error("Error computing hash for %s: %s", file_path, e)
-            return None
+            for path in paths:
+                yield Path(path)
+        finally:
+            paths.close()
 
     def scan_directory(self, directory: Path) -> Set[Path]:
         """Scan a directory for files."""
         try:
-            files = set()
-            for root, _, filenames in os.walk(directory):
-                for filename in filenames:
-                    file_path = Path(root) / filename
-                    if file_path.is_file():
-                        files.add(file_path)
-            return files
+            return {Path(path) for path in self._walk_files(directory)}
         except Exception as e:
             logger.error("Error scanning directory %s: %s", directory, e)
             return set()
 
-    def process_files(self, files: Set[Path]) -> Dict[str, List[Path]]:
-        """Process files in parallel to compute their hashes."""
-        hash_map = {}
-        try:
-            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
-                # Process files in parallel and collect results
-                future_to_file = {
-                    executor.submit(self.compute_file_hash, file_path): file_path
-                    for file_path in files
-                }
-
-                # Collect results as they complete
-                for future in future_to_file:
-                    file_path = future_to_file[future]
-                    try:
-                        file_hash = future.result()
+    def process_files(
+        self, files: Iterable[Union[str, Path]]
+    ) -> Dict[bytes, List[Union[str, Path]]]:
+        """Process files in parallel to compute their hashes.
+
+        Files may come from a lazy iterator. They are queued in batches of
+        ``HASH_BATCH_SIZE`` for worker threads, with at most
+        ``num_workers * 2`` batches waiting, so hashing starts while the
+        scan that produces them is still running. Each worker groups its
+        own results and the groups are merged once all workers finish.
+        Paths are grouped exactly as they were given.
+        """
+        batches: "queue.Queue[Optional[List[Union[str, Path]]]]" = queue.Queue(
+            maxsize=self.num_workers * 2
+        )
+        worker_maps: List[Dict[bytes, List[Union[str, Path]]]] = []
+
+        def worker() -> None:
+            local_map: Dict[bytes, List[Union[str, Path]]] = {}
+            worker_maps.append(local_map)
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                try:
+                    for file_path, file_hash in self._hash_batch(batch):
                         if file_hash:
-                            if file_hash not in hash_map:
-                                hash_map[file_hash] = []
-                            hash_map[file_hash].append(file_path)
-                    except Exception as e:
-                        logger.error("Error processing %s: %s", file_path, e)
+                            local_map.setdefault(file_hash, []).append(file_path)
+                except Exception as e:
+                    logger.error("Error processing file: %s", e)
 
+        workers = [
+            threading.Thread(target=worker, daemon=True)
+            for _ in range(self.num_workers)
+        ]
+        for thread in workers:
+            thread.start()
+
+        try:
+            batch = []
+            for file_path in files:
+                batch.append(file_path)
+                if len(batch) == HASH_BATCH_SIZE:
+                    batches.put(batch)
+                    batch = []
+            if batch:
+                batches.put(batch)
         except Exception as e:
             logger.error("Error in parallel processing: %s", e)
+        finally:
+            for _ in workers:
+                batches.put(None)
+            for thread in workers:
+                thread.join()
 
+        hash_map: Dict[bytes, List[Union[str, Path]]] = {}
+        for local_map in worker_maps:
+            for file_hash, paths in local_map.items():
+                existing = hash_map.get(file_hash)
+                if existing is None:
+                    hash_map[file_hash] = paths
+                else:
+                    existing.extend(paths)
         return hash_map
 
-    def find_duplicates(self, path_or_files: Union[Path, Set[Path]]) -> Dict[str, List[Path]]:
+    def _process_workers(self, file_count: int) -> int:
+        """Number of worker processes to hash file_count files with, or 0.
+
+        Processes need fork to start cheaply and more than one CPU to beat
+        the worker threads. Fork is only used on Linux; macOS does not
+        support forking a process that runs threads of its own system
+        libraries. Nor is it used while other threads run, since a child
+        could inherit a lock one of them holds and never see it released.
+        """
+        if file_count < PROCESS_HASH_MIN_FILES:
+            return 0
+        if not sys.platform.startswith("linux") or threading.active_count() > 1:
+            return 0
+        workers = min(self.num_workers, _AVAILABLE_CPUS)
+        return workers if workers > 1 else 0
+
+    def _hash_in_processes(
+        self, files: List[Union[str, Path]], workers: int
+    ) -> Optional[Dict[bytes, List[Union[str, Path]]]]:
+        """Hash files in forked worker processes and group them by digest.
+
+        Hashing many small files is bound by per-call interpreter work that
+        holds the GIL, so separate processes scale where threads don't.
+        Returns None if the pool can't be started or a worker dies.
+        """
+        hash_file = partial(_keyed_file_hash, algorithm=self.hash_algorithm)
+        chunksize = max(1, len(files) // (workers * 4))
+        hash_map: Dict[bytes, List[Union[str, Path]]] = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            ) as pool:
+                for file_path, (key, file_hash) in zip(
+                    files, pool.map(hash_file, files, chunksize=chunksize)
+                ):
+                    if file_hash:
+                        hash_map.setdefault(file_hash, []).append(file_path)
+                        # Cache the child's digest here, where later calls look
+                        _cache_hash(key, file_hash)
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning("Hashing in worker processes failed, using threads: %s", e)
+            return None
+        return hash_map
+
+    def _size_candidates(
+        self, files: Iterable[Union[str, Path]]
+    ) -> List[Tuple[Union[str, Path], int]]:
+        """Return the files whose size matches another file's, in scan order.
+
+        Each file is paired with its size. Paths and sizes are kept in two
+        parallel sequences, the sizes in a compact array, instead of a list
+        per size, so the unique sizes of most files in a large tree cost no
+        extra objects. Files that can't be stat'ed are skipped.
+        """
+        paths: List[Union[str, Path]] = []
+        sizes = array("q")
+        for file_path in files:
+            try:
+                size = os.stat(file_path).st_size
+            except OSError as e:
+                logger.debug("Skipping %s: %s", file_path, e)
+                continue
+            paths.append(file_path)
+            sizes.append(size)
+
+        size_counts = Counter(sizes)
+        return [
+            (file_path, size)
+            for file_path, size in zip(paths, sizes)
+            if size_counts[size] > 1
+        ]
+
+    def _sample_candidates(
+        self, candidates: List[Tuple[Union[str, Path], int]]
+    ) -> List[Union[str, Path]]:
+        """Drop large candidates whose first or last bytes match no other file.
+
+        Files larger than HASH_CHUNK_SIZE are keyed by their size and their
+        first and last SAMPLE_SIZE bytes; only files sharing a key with
+        another file can be duplicates, so the rest are never read in full.
+        Smaller files are kept as they are. Order is preserved.
+        """
+        if not hasattr(os, "pread"):
+            return [file_path for file_path, _ in candidates]
+
+        keys: List[Optional[Tuple[int, bytes]]] = []
+        for file_path, size in candidates:
+            if size <= HASH_CHUNK_SIZE:
+                keys.append(None)
+                continue
+            try:
+                keys.append((size, _read_samples(file_path, size)))
+            except OSError as e:
+                # Unreadable files can't be hashed either
+                logger.debug("Skipping %s: %s", file_path, e)
+                keys.append((size, None))
+
+        key_counts = Counter(key for key in keys if key is not None)
+        return [
+            file_path
+            for (file_path, _), key in zip(candidates, keys)
+            if key is None or (key[1] is not None and key_counts[key] > 1)
+        ]
+
+    def find_duplicates(self, path_or_files: Union[Path, Set[Path]]) -> Dict[bytes, List[Path]]:
         """Find duplicate files based on their content hash.
 
+        Files are grouped by size first, and large files also by their first
+        and last bytes; only files matching another file's are hashed.
+        Large candidate sets are hashed in worker processes, smaller ones
+        by ``process_files``.
+
         Args:
             path_or_files: Either a directory path to scan or a set of files to process
         """
         if isinstance(path_or_files, Path):
-            files = self.scan_directory(path_or_files)
+            logger.debug("Finding duplicates under %s", path_or_files)
+            files = self._walk_files(path_or_files)
         else:
+            logger.debug("Finding duplicates among %d files", len(path_or_files))
             files = path_or_files
 
-        logger.debug("Finding duplicates among %d files", len(files))
-
-        # Process files to get hash map
-        hash_map = self.process_files(files)
+        # Files of different sizes can't be duplicates, so only files that
+        # share their size with another file are hashed
+        candidates = self._sample_candidates(self._size_candidates(files))
+        workers = self._process_workers(len(candidates))
+        hash_map = self._hash_in_processes(candidates, workers) if workers else None
+        if hash_map is None:
+            hash_map = self.process_files(candidates)
 
-        # Filter out unique files
-        duplicates = {h: paths for h, paths in hash_map.items() if len(paths) > 1}
+        # Filter out unique files, returning Path objects to the caller
+        duplicates = {
+            h: [Path(path) for path in paths]
+            for h, paths in hash_map.items()
+            if len(paths) > 1
+        }
         return duplicates
 
-    def scan_and_report(self, directory: Path) -> Dict[str, List[Path]]:
+    def scan_and_report(self, directory: Path) -> Dict[bytes, List[Path]]:
         """Scan directory and report duplicate files."""
         try:
             if not directory.exists():
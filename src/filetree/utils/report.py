@@ -1,116 +1,139 @@
 """Report generation module."""
+import io
+import os
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, TextIO
 from rich.console import Console
-from rich.table import Table
-from rich.markdown import Markdown
-from rich.progress import track
 
 from ..core.duplicates import DuplicateFinder
-from ..core.scanner import FileTreeScanner
 from .config import Config
 
 class ReportGenerator:
     """Generator for file tree analysis reports."""
 
+    _UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
     def __init__(self):
         """Initialize report generator."""
         self.console = Console()
 
     def _format_size(self, size: int) -> str:
         """Format size in bytes to human readable format."""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if isinstance(size, int) and size > 0:
+            # Each unit is 2**10 times the previous one, so the bit length
+            # picks the unit without a division loop
+            idx = min((size.bit_length() - 1) // 10, len(self._UNITS) - 1)
+            return f"{size / (1 << (idx * 10)):.1f} {self._UNITS[idx]}"
+        for unit in self._UNITS[:-1]:
             if size < 1024.0:
                 return f"{size:.1f} {unit}"
             size /= 1024.0
-        return f"{size:.1f} PB"
+        return f"{size:.1f} {self._UNITS[-1]}"
 
     def _generate_ascii_bar(self, value: int, max_value: int, width: int = 20) -> str:
         """Generate ASCII progress bar."""
         filled = int(width * (value / max_value)) if max_value > 0 else 0
         return f"[{'=' * filled}{' ' * (width - filled)}]"
 
-    def _generate_summary(self, files: List[Path], duplicates: Dict[str, List[Path]]) -> str:
-        """Generate summary section of the report."""
+    def _write_summary(
+        self,
+        out: TextIO,
+        files: List[Path],
+        duplicate_stats: Dict[str, int],
+        file_stats: Dict[Path, os.stat_result]
+    ) -> None:
+        """Write summary section of the report."""
         total_files = len(files)
-        total_size = sum(p.stat().st_size for p in files if p.exists())
-        duplicate_stats = DuplicateFinder().get_duplicate_stats(duplicates)
-
-        summary = [
-            "# 📊 File Tree Analysis Report",
-            "\n## 📈 Summary",
-            f"\n- Total Files: {total_files:,}",
-            f"- Total Size: {self._format_size(total_size)}",
-            f"- Duplicate Groups: {duplicate_stats['total_groups']:,}",
-            f"- Total Duplicates: {duplicate_stats['total_duplicates']:,}",
-            f"- Wasted Space: {self._format_size(duplicate_stats['wasted_space'])}"
-        ]
-        return "\n".join(summary)
-
-    def _generate_file_type_distribution(self, files: List[Path]) -> str:
-        """Generate file type distribution section."""
-        scanner = FileTreeScanner(Config())
-        type_dist = scanner.get_file_types(files)
-        
-        if not type_dist:
-            return "\n## 📁 File Type Distribution\n\nNo files found."
+        total_size = 0
+        for file in files:
+            try:
+                cached = file_stats.get(file)
+                total_size += cached.st_size if cached else os.path.getsize(file)
+            except OSError:
+                continue
+
+        out.write("# 📊 File Tree Analysis Report\n\n## 📈 Summary\n")
+        out.write(f"\n- Total Files: {total_files:,}")
+        out.write(f"\n- Total Size: {self._format_size(total_size)}")
+        out.write(f"\n- Duplicate Groups: {duplicate_stats['total_groups']:,}")
+        out.write(f"\n- Total Duplicates: {duplicate_stats['total_duplicates']:,}")
+        out.write(f"\n- Wasted Space: {self._format_size(duplicate_stats['wasted_space'])}")
+
+    def _write_file_type_distribution(self, out: TextIO, type_counts: Counter) -> None:
+        """Write file type distribution section."""
+        out.write("\n\n## 📁 File Type Distribution\n")
+        if not type_counts:
+            out.write("\nNo files found.")
+            return
             
-        total_files = sum(type_dist.values())
-        max_count = max(type_dist.values())
+        type_dist = type_counts.most_common()
+        total_files = sum(type_counts.values())
+        max_count = type_dist[0][1]
         
-        distribution = ["\n## 📁 File Type Distribution\n"]
-        for ext, count in type_dist.items():
+        for ext, count in type_dist:
             percentage = (count / total_files) * 100
             bar = self._generate_ascii_bar(count, max_count)
-            distribution.append(
-                f"- {ext:<15} {count:>4} files {bar} {percentage:>5.1f}%"
-            )
-            
-        return "\n".join(distribution)
+            out.write(f"\n- {ext:<15} {count:>4} files {bar} {percentage:>5.1f}%")
 
-    def _generate_duplicate_findings(self, duplicates: Dict[str, List[Path]]) -> str:
-        """Generate duplicate files section."""
+    def _write_duplicate_findings(
+        self,
+        out: TextIO,
+        duplicates: Dict[str, List[Path]],
+        file_stats: Dict[Path, os.stat_result]
+    ) -> None:
+        """Write duplicate files section."""
+        out.write("\n\n## 🔍 Duplicate Files\n")
         if not duplicates:
-            return "\n## 🔍 Duplicate Files\n\nNo duplicate files found."
+            out.write("\nNo duplicate files found.")
+            return
             
-        findings = ["\n## 🔍 Duplicate Files\n"]
         for hash_value, files in duplicates.items():
             if not files:
                 continue
                 
             try:
-                size = files[0].stat().st_size
-                findings.append(f"\n### Group ({self._format_size(size)} each)")
-                for file in files:
-                    findings.append(f"- {file}")
+                cached = file_stats.get(files[0])
+                size = cached.st_size if cached else os.path.getsize(files[0])
             except OSError:
                 continue
-                
-        return "\n".join(findings)
 
-    def _generate_recommendations(self, duplicates: Dict[str, List[Path]]) -> str:
-        """Generate recommendations section."""
+            out.write(f"\n\n### Group ({self._format_size(size)} each)")
+            for file in files:
+                out.write(f"\n- {file}")
+
+    def _write_recommendations(self, out: TextIO, duplicates: Dict[str, List[Path]]) -> None:
+        """Write recommendations section."""
+        out.write("\n\n## 💡 Recommendations\n")
         if not duplicates:
-            return "\n## 💡 Recommendations\n\nNo issues found. Your file structure looks good!"
+            out.write("\nNo issues found. Your file structure looks good!")
+            return
             
-        recommendations = [
-            "\n## 💡 Recommendations",
-            "\nHere are some suggestions to optimize your file structure:",
-            "\n1. **Review Duplicate Files**",
-            "   - Use interactive mode (`--interactive`) to manage duplicates",
-            "   - Consider using symbolic links for frequently accessed duplicates",
-            "   - Backup important files before deletion",
-            "\n2. **Storage Optimization**",
-            "   - Remove unnecessary duplicate files",
-            "   - Consider archiving rarely accessed files",
-            "   - Use version control instead of keeping multiple copies",
-            "\n3. **Best Practices**",
-            "   - Implement a consistent file naming convention",
-            "   - Organize files into logical directories",
-            "   - Use version control for tracking changes",
-            "   - Regular cleanup of temporary and cache files"
-        ]
-        return "\n".join(recommendations)
+        out.write(
+            "\nHere are some suggestions to optimize your file structure:\n"
+            "\n1. **Review Duplicate Files**"
+            "\n   - Use interactive mode (`--interactive`) to manage duplicates"
+            "\n   - Consider using symbolic links for frequently accessed duplicates"
+            "\n   - Backup important files before deletion\n"
+            "\n2. **Storage Optimization**"
+            "\n   - Remove unnecessary duplicate files"
+            "\n   - Consider archiving rarely accessed files"
+            "\n   - Use version control instead of keeping multiple copies\n"
+            "\n3. **Best Practices**"
+            "\n   - Implement a consistent file naming convention"
+            "\n   - Organize files into logical directories"
+            "\n   - Use version control for tracking changes"
+            "\n   - Regular cleanup of temporary and cache files"
+        )
+
+    def _write_configuration(self, out: TextIO, config: Config) -> None:
+        """Write configuration section."""
+        out.write("\n\n## ⚙️ Configuration Used\n")
+        out.write(f"\n- Ignore Patterns: {', '.join(config.ignore_patterns)}")
+        out.write(f"\n- Follow Symlinks: {config.follow_symlinks}")
+        out.write(f"\n- Include Hidden: {config.include_hidden}")
+        out.write(f"\n- Min File Size: {self._format_size(config.min_file_size)}")
+        out.write(f"\n- Max Depth: {'Unlimited' if config.max_depth is None else config.max_depth}")
 
     def generate_report(
         self,
@@ -118,20 +141,37 @@ class ReportGenerator:
         files: List[Path],
         duplicates: Dict[str, List[Path]],
         config: Config,
-        show_tree: bool = True
-    ) -> str:
-        """Generate complete analysis report."""
-        sections = [
-            self._generate_summary(files, duplicates),
-            self._generate_file_type_distribution(files),
-            self._generate_duplicate_findings(duplicates),
-            self._generate_recommendations(duplicates),
-            "\n## ⚙️ Configuration Used",
-            f"\n- Ignore Patterns: {', '.join(config.ignore_patterns)}",
-            f"- Follow Symlinks: {config.follow_symlinks}",
-            f"- Include Hidden: {config.include_hidden}",
-            f"- Min File Size: {self._format_size(config.min_file_size)}",
-            f"- Max Depth: {'Unlimited' if config.max_depth is None else config.max_depth}"
-        ]
-        
-        return "\n".join(sections) 
\ No newline at end of file
+        show_tree: bool = True,
+        file_stats: Optional[Dict[Path, os.stat_result]] = None,
+        type_counts: Optional[Counter] = None,
+        duplicate_stats: Optional[Dict[str, int]] = None,
+        out: Optional[TextIO] = None
+    ) -> Optional[str]:
+        """Generate complete analysis report.
+
+        The report is written section by section to ``out`` when given, and
+        None is returned; otherwise it is built in memory and returned.
+
+        ``file_stats`` and ``type_counts`` should hold the stat results and
+        extension counts captured while scanning (see ``FileTreeScanner``),
+        and ``duplicate_stats`` the result of
+        ``DuplicateFinder.get_duplicate_stats`` from the finder that produced
+        ``duplicates``. Any of them not given is computed here; files
+        missing from ``file_stats`` are stat'ed when their size is needed.
+        """
+        if file_stats is None:
+            file_stats = {}
+        if type_counts is None:
+            type_counts = Counter(file.suffix.lower() or '(no extension)' for file in files)
+        if duplicate_stats is None:
+            duplicate_stats = DuplicateFinder().get_duplicate_stats(duplicates)
+
+        # Every section writes straight into one stream; lines are
+        # written with their leading newline so no joins are needed
+        buf = io.StringIO() if out is None else out
+        self._write_summary(buf, files, duplicate_stats, file_stats)
+        self._write_file_type_distribution(buf, type_counts)
+        self._write_duplicate_findings(buf, duplicates, file_stats)
+        self._write_recommendations(buf, duplicates)
+        self._write_configuration(buf, config)
+        return buf.getvalue() if out is None else None
@@ -1,76 +1,197 @@
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Set, Tuple
 from rich.tree import Tree
 from rich.style import Style
+from itertools import chain
+from operator import attrgetter
 import json
+import os
+
+_entry_name = attrgetter("name")
+
+# Encodes a list of path strings in one call to the C encoder, laid out the
+# way json.dump(indent=2) lays out a list nested one level deep
+_PATH_LIST_ENCODER = json.JSONEncoder(separators=(",\n    ", ": "))
 
 class FileTreeVisualizer:
     """Visualize file tree structure."""
 
+    # Entry kinds produced by _scan_flat
+    FILE, DIRECTORY, DUPLICATE, SYMLINK, DENIED = range(5)
+
+    # Markup opening and closing the label per kind; plain files are added
+    # by bare name. Concatenating these is cheaper than str.format, and
+    # unlike caching whole labels it costs nothing for unique names.
+    _LABEL_AFFIXES = {
+        DIRECTORY: ("[bold blue]", "[/bold blue]"),
+        DUPLICATE: ("[red]", "[/red]"),
+        SYMLINK: ("[cyan]", "[/cyan]"),
+        DENIED: ("[yellow]", "[/yellow]"),
+    }
+
     def __init__(self):
         """Initialize visualizer."""
         self.duplicate_style = Style(color="red")
         self.symlink_style = Style(color="cyan")
         self.directory_style = Style(color="blue", bold=True)
 
-    def export_results(self, duplicates: Dict[str, List[Path]], export_path: Path) -> None:
+    def export_results(
+        self,
+        duplicates: Dict[str, List[Path]],
+        export_path: Path,
+        size_by_hash: Optional[Dict[str, int]] = None
+    ) -> None:
         """Export duplicate file information to JSON.
         
+        Groups are written to the file one at a time, so no second copy of
+        every path is built in memory; the output matches ``json.dump`` with
+        ``indent=2``, with the summary as the last key.
+        
         Args:
             duplicates: Dictionary mapping hash values to lists of duplicate file paths
             export_path: Path to export the results to
+            size_by_hash: File size of each group, e.g. ``DuplicateFinder.group_sizes``;
+                groups missing from it are sized with a stat of their first file
         """
-        # Convert Path objects to strings for JSON serialization
-        export_data = {
-            hash_value: [str(path) for path in paths]
-            for hash_value, paths in duplicates.items()
-        }
-        
-        # Add summary information
-        export_data["summary"] = {
-            "total_groups": len(duplicates),
-            "total_duplicates": sum(len(paths) - 1 for paths in duplicates.values()),
-            "total_wasted_space": sum(Path(paths[0]).stat().st_size * (len(paths) - 1) 
-                                    for paths in duplicates.values() if paths)
-        }
+        size_by_hash = size_by_hash or {}
+        total_duplicates = 0
+        total_wasted_space = 0
         
-        # Write to file
         with open(export_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+            f.write("{")
+            separator = "\n"
+            for hash_value, paths in duplicates.items():
+                f.write(f"{separator}  {json.dumps(hash_value)}: ")
+                if paths:
+                    encoded = _PATH_LIST_ENCODER.encode([os.fspath(path) for path in paths])
+                    f.write(f"[\n    {encoded[1:-1]}\n  ]")
+                    size = size_by_hash.get(hash_value)
+                    if size is None:
+                        size = os.stat(paths[0]).st_size
+                    total_wasted_space += size * (len(paths) - 1)
+                else:
+                    f.write("[]")
+                total_duplicates += len(paths) - 1
+                separator = ",\n"
+            
+            # Add summary information
+            summary = {
+                "total_groups": len(duplicates),
+                "total_duplicates": total_duplicates,
+                "total_wasted_space": total_wasted_space
+            }
+            summary_json = json.dumps(summary, indent=2).replace("\n", "\n  ")
+            f.write(f'{separator}  "summary": {summary_json}\n}}')
 
     def create_tree(self, root_path: Path, duplicates: Dict[str, List[Path]] = None) -> Tree:
-        """Create a tree visualization of the directory structure."""
+        """Create a tree visualization of the directory structure.
+
+        The directory is first flattened into ``(depth, name, kind)`` records
+        by ``_scan_flat``; the Tree is then stitched together from those
+        records in a single pass.
+        """
         duplicates = duplicates or {}
-        duplicate_paths: Set[Path] = {
-            path for paths in duplicates.values() for path in paths
-        }
+        # The root and every duplicate are made absolute once, here, so
+        # relative and absolute forms of the same path match. This is done
+        # lexically, from a single getcwd call, rather than with resolve(),
+        # which would stat every component of every path.
+        cwd = os.getcwd()
+        root = os.path.normpath(os.path.join(cwd, root_path))
+        # Index duplicate file names by the prefix of their directory, as
+        # built by _child_prefix; each directory then looks up its set once
+        # and its files are matched by bare name, never via Path
+        duplicate_names: Dict[str, Set[str]] = {}
+        for paths in duplicates.values():
+            for path in paths:
+                directory, name = os.path.split(os.path.normpath(os.path.join(cwd, path)))
+                duplicate_names.setdefault(self._child_prefix(directory), set()).add(name)
         tree = Tree(f"[bold blue]{root_path.name}[/bold blue]")
-        self._add_directory(tree, root_path, duplicate_paths)
+
+        # siblings[d] is the children list of the most recent directory at
+        # depth d, i.e. where any record at depth d + 1 is appended. Nodes
+        # are built directly with the settings Tree.add would give them
+        # under this root, skipping its per-call argument handling.
+        siblings = [tree.children]
+        label_affixes = self._LABEL_AFFIXES
+        file_kind = self.FILE
+        directory_kind = self.DIRECTORY
+        for depth, name, kind in self._scan_flat(root, duplicate_names):
+            del siblings[depth:]
+            if kind == file_kind:
+                label = name
+            else:
+                opening, closing = label_affixes[kind]
+                label = opening + name + closing
+            node = Tree(label)
+            siblings[-1].append(node)
+            if kind == directory_kind:
+                siblings.append(node.children)
         return tree
 
-    def _add_directory(self, tree: Tree, directory: Path, duplicate_paths: Set[Path]) -> None:
-        """Add directory contents to tree."""
-        try:
-            paths = sorted(directory.iterdir(), key=lambda p: (not p.is_dir(), p.name))
-            for path in paths:
-                if path.is_dir():
-                    branch = tree.add(f"[bold blue]{path.name}[/bold blue]")
-                    self._add_directory(branch, path, duplicate_paths)
-                else:
-                    style = self._get_style(path, duplicate_paths)
-                    name = path.name
-                    if style == self.duplicate_style:
-                        name = f"[red]{name}[/red]"
-                    elif style == self.symlink_style:
-                        name = f"[cyan]{name}[/cyan]"
-                    tree.add(name)
-        except PermissionError:
-            tree.add("[yellow]Permission denied[/yellow]")
-
-    def _get_style(self, path: Path, duplicate_paths: Set[Path]) -> Style:
-        """Get style for file based on its properties."""
-        if path in duplicate_paths:
-            return self.duplicate_style
-        if path.is_symlink():
-            return self.symlink_style
-        return Style()
\ No newline at end of file
+    @staticmethod
+    def _child_prefix(directory: str) -> str:
+        """Get the string that prefixes the names of an absolute directory's children."""
+        if directory.endswith(os.sep):
+            return directory
+        return directory + os.sep
+
+    def _scan_flat(
+        self,
+        root_path: str,
+        duplicate_names: Dict[str, Set[str]]
+    ) -> List[Tuple[int, str, int]]:
+        """Flatten the directory into depth-first ``(depth, name, kind)`` records."""
+        records: List[Tuple[int, str, int]] = []
+        stack = []
+        no_duplicates: FrozenSet[str] = frozenset()
+
+        def open_directory(depth: int, directory: str, prefix: str) -> None:
+            subdirs = []
+            files = []
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry)
+                        else:
+                            files.append(entry)
+            except PermissionError:
+                records.append((depth, "Permission denied", self.DENIED))
+                return
+            # Directories first, then files, each sorted by name; sorting
+            # the two groups apart needs no tuple key per entry
+            subdirs.sort(key=_entry_name)
+            files.sort(key=_entry_name)
+            stack.append((
+                depth, chain(subdirs, files), prefix,
+                duplicate_names.get(prefix, no_duplicates)
+            ))
+
+        open_directory(1, root_path, self._child_prefix(root_path))
+        while stack:
+            depth, entries, prefix, dir_duplicates = stack[-1]
+            entry = next(entries, None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                path = prefix + entry.name
+                records.append((depth, entry.name, self.DIRECTORY))
+                open_directory(depth + 1, path, path + os.sep)
+            else:
+                records.append((depth, entry.name, self._get_style(entry, dir_duplicates)))
+
+        return records
+
+    def _get_style(self, entry: os.DirEntry, dir_duplicates: AbstractSet[str]) -> int:
+        """Get the kind of a file entry based on its properties.
+
+        ``dir_duplicates`` holds the names of the duplicate files in the
+        entry's directory.
+        """
+        if entry.name in dir_duplicates:
+            return self.DUPLICATE
+        if entry.is_symlink():
+            return self.SYMLINK
+        return self.FILE
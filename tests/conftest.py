@@ -1,15 +1,79 @@
+import os
 import pytest
 from pathlib import Path
-import tempfile
-import shutil
 import json
+import shutil
 import sys
+import tempfile
+
+# In-memory filesystem for the session's temporary files, where available
+_SHM_DIR = "/dev/shm"
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Put the temporary directories of the session on tmpfs.
+
+    The tests write many small files; kept in memory they never reach the
+    disk. An explicit --basetemp is left as it is.
+    """
+    if config.option.basetemp is None and os.access(_SHM_DIR, os.W_OK):
+        config.option.basetemp = tempfile.mkdtemp(prefix="filetree-tests-", dir=_SHM_DIR)
+        config._shm_basetemp = config.option.basetemp
+
+def pytest_unconfigure(config):
+    """Remove the tmpfs directory created for the session."""
+    basetemp = getattr(config, "_shm_basetemp", None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+@pytest.fixture(scope="session")
+def run_cli():
+    """Run the CLI on a path string with extra command line arguments."""
+    from filetree.cli import main
+
+    def run(path, *extra):
+        return main([path, *extra])
+    return run
+
+@pytest.fixture(scope="session")
+def nonexistent_path():
+    """A path string that is not expected to exist."""
+    return str(Path("/nonexistent"))
 
 @pytest.fixture
-def temp_dir():
+def temp_dir(tmp_path):
     """Create a temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
+
+@pytest.fixture(scope="session")
+def duplicate_tree(tmp_path_factory):
+    """Create a tree with two groups of duplicate files, shared by the session.
+
+    Tests must not modify it; those that do need their own tree.
+    """
+    root = tmp_path_factory.mktemp("duplicates")
+    
+    subdir = root / "subdir"
+    subdir.mkdir()
+    (root / "unique.txt").write_bytes(b"unique")
+    
+    # Each duplicate is written once and then linked to its copy's name
+    for original, duplicate, content in (
+        (root / "file1.txt", root / "file2.txt", b"content1"),
+        (subdir / "file3.txt", subdir / "file4.txt", b"content2"),
+    ):
+        original.write_bytes(content)
+        if hasattr(os, "link"):
+            os.link(original, duplicate)
+        else:
+            duplicate.write_bytes(content)
+    
+    return root
+
+@pytest.fixture(scope="session")
+def duplicate_tree_str(duplicate_tree):
+    """Path of the shared duplicate tree as a string, computed once."""
+    return str(duplicate_tree)
 
 @pytest.fixture
 def mock_file_tree(temp_dir):
@@ -20,11 +84,11 @@ def mock_file_tree(temp_dir):
     (temp_dir / "tests").mkdir()
     
     # Create some files
-    (temp_dir / "src" / "main.py").write_text("print('main')")
-    (temp_dir / "src" / "utils" / "helper.py").write_text("def help(): pass")
+    (temp_dir / "src" / "main.py").write_bytes(b"print('main')")
+    (temp_dir / "src" / "utils" / "helper.py").write_bytes(b"def help(): pass")
     # Duplicate file
-    (temp_dir / "lib" / "utils" / "helper.py").write_text("def help(): pass")
-    (temp_dir / "README.md").write_text("# Test Project")
+    (temp_dir / "lib" / "utils" / "helper.py").write_bytes(b"def help(): pass")
+    (temp_dir / "README.md").write_bytes(b"# Test Project")
     
     # Create a symlink only on non-Windows systems
     if not sys.platform.startswith('win'):
@@ -32,21 +96,21 @@ def mock_file_tree(temp_dir):
     
     return temp_dir
 
-@pytest.fixture
-def mock_config_file(temp_dir):
-    """Create a mock configuration file."""
+@pytest.fixture(scope="session")
+def mock_config_file(tmp_path_factory):
+    """Create a mock configuration file, shared by the session."""
     config = {
-        "similarity_threshold": 0.9,
-        "ignore_patterns": ["*.pyc", "__pycache__"],
-        "file_annotations": {
-            ".py": "[yellow](Python)[/yellow]",
-            ".md": "[green](Markdown)[/green]"
-        },
-        "debug_mode": True
+        "ignore_patterns": ["*.tmp", "*.log"],
+        "follow_symlinks": True,
+        "min_file_size": 1000,
+        "max_depth": 5,
+        "include_hidden": True,
+        "use_color": False,
+        "output_format": "json"
     }
     
-    config_path = temp_dir / "config.json"
+    config_path = tmp_path_factory.mktemp("cfg") / "config.json"
     with open(config_path, "w") as f:
         json.dump(config, f)
     
-    return config_path 
\ No newline at end of file
+    return config_path
@@ -1,136 +1,145 @@
 """Tests for the command-line interface."""
 import os
-import tempfile
 from pathlib import Path
-from unittest.mock import patch, MagicMock, ANY, call
+from unittest.mock import patch
 import pytest
-from filetree.cli import main
+from filetree.cli import _handle_interrupt
 from filetree.utils.config import Config
-from rich.console import Console
+
+class _ConsoleStub:
+    """Stand-in for the CLI console that records what is printed."""
+
+    def __init__(self):
+        self.calls = []
+
+    def print(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+
+class _SilentConsole:
+    """Stand-in for the CLI console that discards what is printed."""
+
+    def print(self, *args, **kwargs):
+        pass
+
+class _FakeFinder:
+    """Stand-in for DuplicateFinder that returns preset results.
+
+    Tests set ``duplicates`` and ``stats`` on the class handed out by the
+    ``fake_finder`` fixture; every instance the CLI creates is recorded in
+    ``instances``.
+    """
+
+    duplicates = {}
+    stats = {
+        'total_groups': 0,
+        'total_duplicates': 0,
+        'wasted_space': 0
+    }
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.init_kwargs = kwargs
+        self.instances.append(self)
+
+    def find_duplicates(self, files, file_stats=None):
+        self.file_stats = file_stats
+        return self.duplicates
+
+    def get_duplicate_stats(self, duplicates):
+        return self.stats
 
 @pytest.fixture
-def test_directory():
-    """Create a temporary directory with test files."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        root = Path(tmp_dir)
-        
-        # Create some test files
-        (root / "file1.txt").write_text("content1")
-        (root / "file2.txt").write_text("content1")  # Duplicate
-        (root / "unique.txt").write_text("unique")
-        
-        # Create a subdirectory with more files
-        subdir = root / "subdir"
-        subdir.mkdir()
-        (subdir / "file3.txt").write_text("content2")
-        (subdir / "file4.txt").write_text("content2")  # Duplicate
-        
-        yield root
+def fake_finder(monkeypatch):
+    """Replace the CLI's DuplicateFinder with a fresh _FakeFinder subclass."""
+    finder_class = type("FakeFinder", (_FakeFinder,), {"instances": []})
+    monkeypatch.setattr("filetree.cli.DuplicateFinder", finder_class)
+    return finder_class
+
+@pytest.fixture(scope="session")
+def empty_directory(tmp_path_factory):
+    """Empty directory to scan; the faked finder supplies the duplicates."""
+    return str(tmp_path_factory.mktemp("empty"))
+
+@pytest.fixture(autouse=True, scope="module")
+def _silent_console():
+    """Discard CLI output for the whole module."""
+    with patch("filetree.cli.console", _SilentConsole()):
+        yield
 
 @pytest.fixture
-def mock_console():
-    return MagicMock(spec=Console)
+def mock_console(monkeypatch):
+    """Record CLI output, for tests that check what is printed."""
+    stub = _ConsoleStub()
+    monkeypatch.setattr("filetree.cli.console", stub)
+    return stub
 
-def test_main_invalid_directory(mock_console):
+def test_main_invalid_directory(mock_console, run_cli, nonexistent_path):
     """Test main with invalid directory."""
-    nonexistent = str(Path("/nonexistent"))
-    with patch("filetree.cli.console", mock_console):
-        with patch("sys.argv", ["filetree", nonexistent]):
-            assert main() == 1
-            mock_console.print.assert_called_with(f"[red]Directory not found: {nonexistent}[/red]")
-
-@patch('filetree.cli.console')
-def test_main_no_duplicates(mock_console, test_directory):
-    """Test main function with no duplicates."""
-    with patch('sys.argv', ['script.py', str(test_directory)]):
-        with patch('filetree.cli.DuplicateFinder') as mock_finder_class:
-            mock_finder = MagicMock()
-            mock_finder.find_duplicates.return_value = {}
-            mock_finder.get_duplicate_stats.return_value = {
-                'total_groups': 0,
-                'total_duplicates': 0,
-                'wasted_space': 0
-            }
-            mock_finder_class.return_value = mock_finder
-            main()
-
-        # Verify that the correct message was printed
-        mock_console.print.assert_any_call(ANY)  # Scanning message
-        mock_console.print.assert_any_call(ANY)  # Analysis message
-        mock_console.print.assert_any_call(ANY)  # Report with no duplicates
-
-@patch('filetree.cli.console')
-def test_main_with_duplicates(mock_console, test_directory):
-    """Test main function with duplicates in non-interactive mode."""
-    with patch('sys.argv', ['script.py', str(test_directory)]):
-        with patch('filetree.cli.DuplicateFinder') as mock_finder_class:
-            mock_finder = MagicMock()
-            mock_finder.find_duplicates.return_value = {
-                'hash1': [Path('file1.txt'), Path('file2.txt')],
-                'hash2': [Path('file3.txt'), Path('file4.txt')]
-            }
-            mock_finder.get_duplicate_stats.return_value = {
-                'total_groups': 2,
-                'total_duplicates': 2,
-                'wasted_space': 1000
-            }
-            mock_finder_class.return_value = mock_finder
-            main()
-
-        # Verify that the correct messages were printed
-        mock_console.print.assert_any_call(ANY)  # Scanning message
-        mock_console.print.assert_any_call(ANY)  # Analysis message
-        mock_console.print.assert_any_call(ANY)  # Report with duplicates
-
-@patch('filetree.cli.console')
-def test_main_with_export(mock_console, test_directory):
+    assert run_cli(nonexistent_path) == 1
+    assert mock_console.calls[-1] == ((f"[red]Directory not found: {nonexistent_path}[/red]",), {})
+
+@pytest.mark.parametrize("duplicates,stats", [
+    ({}, _FakeFinder.stats),
+    (
+        {
+            'hash1': [Path('file1.txt'), Path('file2.txt')],
+            'hash2': [Path('file3.txt'), Path('file4.txt')]
+        },
+        {
+            'total_groups': 2,
+            'total_duplicates': 2,
+            'wasted_space': 1000
+        }
+    ),
+], ids=["no_duplicates", "with_duplicates"])
+def test_main_report(mock_console, fake_finder, empty_directory, duplicates, stats, run_cli):
+    """Test main function with and without duplicates in non-interactive mode."""
+    fake_finder.duplicates = duplicates
+    fake_finder.stats = stats
+    assert run_cli(empty_directory) == 0
+
+    # Verify that the scanning, analysis and report messages were printed
+    printed = [args[0] for args, _ in mock_console.calls]
+    assert printed[:2] == [
+        "\n[bold cyan]🔍 Scanning directory...[/bold cyan]",
+        "[bold cyan]🔍 Analyzing duplicates...[/bold cyan]"
+    ]
+    assert printed[2].startswith("# 📊 File Tree Analysis Report")
+    assert f"- Duplicate Groups: {stats['total_groups']}" in printed[2]
+
+@pytest.mark.parametrize("extra_args,min_size", [
+    (['--min-size', '1000'], 1000),
+    (['--exclude', '*.tmp', '*.log'], 1),
+    (['--no-tree'], 1),
+], ids=["min_size", "exclude_patterns", "no_tree"])
+def test_main_with_options(fake_finder, empty_directory, extra_args, min_size, run_cli):
+    """Test main function with command line options."""
+    assert run_cli(empty_directory, *extra_args) == 0
+    assert [finder.init_kwargs for finder in fake_finder.instances] == [{'min_size': min_size}]
+
+def test_main_reuses_scan_stats(fake_finder, duplicate_tree_str, run_cli):
+    """Test that duplicate detection gets the sizes found by the scan."""
+    assert run_cli(duplicate_tree_str) == 0
+    file_stats = fake_finder.instances[0].file_stats
+    assert {path.name for path in file_stats} == {
+        "unique.txt", "file1.txt", "file2.txt", "file3.txt", "file4.txt"
+    }
+
+def test_handle_interrupt(mock_console):
+    """Test the message and exit code for a user interrupt."""
+    assert _handle_interrupt() == 130
+    assert mock_console.calls == [(("\n[yellow]Operation cancelled by user[/yellow]",), {})]
+
+def test_main_keyboard_interrupt(mock_console, fake_finder, empty_directory, monkeypatch, run_cli):
+    """Test that an interrupt while scanning exits cleanly."""
+    def interrupt(self, files, file_stats=None):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(fake_finder, "find_duplicates", interrupt)
+    assert run_cli(empty_directory) == 130
+    assert mock_console.calls[-1] == (("\n[yellow]Operation cancelled by user[/yellow]",), {})
+
+def test_main_with_export(fake_finder, empty_directory, tmp_path_factory, run_cli):
     """Test main function with export option."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        export_path = Path(tmp_dir) / "results.md"
-        with patch('sys.argv', ['script.py', str(test_directory), '--export', str(export_path)]):
-            with patch('filetree.cli.DuplicateFinder') as mock_finder_class:
-                mock_finder = MagicMock()
-                mock_finder.find_duplicates.return_value = {}
-                mock_finder.get_duplicate_stats.return_value = {
-                    'total_groups': 0,
-                    'total_duplicates': 0,
-                    'wasted_space': 0
-                }
-                mock_finder_class.return_value = mock_finder
-                main()
-                assert export_path.exists()
-
-@patch('filetree.cli.console')
-def test_main_with_min_size(mock_console, test_directory):
-    """Test main function with minimum file size option."""
-    min_size = 1000
-    with patch('sys.argv', ['script.py', str(test_directory), '--min-size', str(min_size)]):
-        with patch('filetree.cli.DuplicateFinder') as mock_finder_class:
-            mock_finder = MagicMock()
-            mock_finder.find_duplicates.return_value = {}
-            mock_finder.get_duplicate_stats.return_value = {
-                'total_groups': 0,
-                'total_duplicates': 0,
-                'wasted_space': 0
-            }
-            mock_finder_class.return_value = mock_finder
-            main()
-            assert mock_finder_class.call_count == 1
-            assert mock_finder_class.call_args[1]['min_size'] == min_size
-
-@patch('filetree.cli.console')
-def test_main_with_exclude_patterns(mock_console, test_directory):
-    """Test main function with exclude patterns."""
-    exclude_patterns = ['*.tmp', '*.log']
-    with patch('sys.argv', ['script.py', str(test_directory), '--exclude'] + exclude_patterns):
-        with patch('filetree.cli.DuplicateFinder') as mock_finder_class:
-            mock_finder = MagicMock()
-            mock_finder.find_duplicates.return_value = {}
-            mock_finder.get_duplicate_stats.return_value = {
-                'total_groups': 0,
-                'total_duplicates': 0,
-                'wasted_space': 0
-            }
-            mock_finder_class.return_value = mock_finder
-            main()
-            mock_console.print.assert_any_call(ANY)
\ No newline at end of file
+    export_path = tmp_path_factory.mktemp("export") / "results.md"
+    assert run_cli(empty_directory, '--export', str(export_path)) == 0
+    assert export_path.exists()
\ No newline at end of file
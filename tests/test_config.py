@@ -1,61 +1,55 @@
 """Tests for the configuration module."""
-import json
-import tempfile
-from pathlib import Path
 import pytest
 from filetree.utils.config import Config
 
-@pytest.fixture
-def temp_config_file():
-    """Create a temporary config file."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        config_data = {
-            "ignore_patterns": ["*.tmp", "*.log"],
-            "follow_symlinks": True,
-            "min_file_size": 1000,
-            "max_depth": 5,
-            "include_hidden": True,
-            "use_color": False,
-            "output_format": "json"
-        }
-        json.dump(config_data, f)
-        return Path(f.name)
+# (attribute, default value, value loaded from mock_config_file)
+_SCALAR_OPTIONS = [
+    ("follow_symlinks", False, True),
+    ("min_file_size", 1, 1000),
+    ("max_depth", None, 5),
+    ("include_hidden", False, True),
+    ("use_color", True, False),
+    ("output_format", "text", "json"),
+]
 
-def test_default_config():
+@pytest.fixture(scope="module")
+def default_config():
+    """Default configuration shared by the read-only default tests."""
+    return Config()
+
+@pytest.fixture(scope="module")
+def loaded_config(mock_config_file):
+    """Configuration loaded from the temporary config file."""
+    return Config.from_file(mock_config_file)
+
+def test_default_ignore_patterns(default_config):
+    """Test default ignore patterns."""
+    assert "*.egg" in default_config.ignore_patterns
+    assert "*.pyc" in default_config.ignore_patterns
+
+@pytest.mark.parametrize("attr,default,loaded", _SCALAR_OPTIONS)
+def test_default_config(default_config, attr, default, loaded):
     """Test default configuration values."""
-    config = Config()
-    
-    assert "*.egg" in config.ignore_patterns
-    assert "*.pyc" in config.ignore_patterns
-    assert not config.follow_symlinks
-    assert config.min_file_size == 1
-    assert config.max_depth is None
-    assert not config.include_hidden
-    assert config.use_color
-    assert config.output_format == "text"
+    assert getattr(default_config, attr) == default
 
-def test_config_from_file(temp_config_file):
-    """Test loading configuration from file."""
-    config = Config.from_file(temp_config_file)
-    
-    assert "*.tmp" in config.ignore_patterns
-    assert "*.log" in config.ignore_patterns
-    assert config.follow_symlinks
-    assert config.min_file_size == 1000
-    assert config.max_depth == 5
-    assert config.include_hidden
-    assert not config.use_color
-    assert config.output_format == "json"
+def test_config_from_file_ignore_patterns(loaded_config):
+    """Test loading ignore patterns from file."""
+    assert "*.tmp" in loaded_config.ignore_patterns
+    assert "*.log" in loaded_config.ignore_patterns
+
+@pytest.mark.parametrize("attr,default,loaded", _SCALAR_OPTIONS)
+def test_config_from_file(loaded_config, attr, default, loaded):
+    """Test loading configuration values from file."""
+    assert getattr(loaded_config, attr) == loaded
 
-def test_config_to_file():
+def test_config_to_file(tmp_path):
     """Test saving configuration to file."""
     config = Config()
     config.ignore_patterns = ["*.test"]
     config.follow_symlinks = True
     config.min_file_size = 500
     
-    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
-        config_file = Path(f.name)
+    config_file = tmp_path / "config.json"
     
     config.to_file(config_file)
     loaded_config = Config.from_file(config_file)
@@ -0,0 +1,71 @@
+"""Tests for the duplicate finder module."""
+import hashlib
+import os
+import pytest
+from filetree.core.duplicates import DuplicateFinder, SMALL_FILE_SIZE
+
+@pytest.fixture
+def finder():
+    """Create a duplicate finder instance for testing."""
+    return DuplicateFinder()
+
+def _groups(duplicates):
+    """Get duplicate groups as sorted lists of file names."""
+    return sorted(sorted(path.name for path in paths) for paths in duplicates.values())
+
+@pytest.mark.parametrize("size", [1, SMALL_FILE_SIZE, SMALL_FILE_SIZE + 1, 3 * SMALL_FILE_SIZE])
+def test_find_duplicates_by_size(finder, tmp_path, size):
+    """Test files compared by content and by chunked hash on either side of the limit."""
+    data = os.urandom(size)
+    other = bytes([data[0] ^ 1]) + data[1:]
+    files = []
+    for name, content in (("a.bin", data), ("b.bin", data), ("c.bin", other)):
+        (tmp_path / name).write_bytes(content)
+        files.append(tmp_path / name)
+
+    duplicates = finder.find_duplicates(files)
+
+    assert _groups(duplicates) == [["a.bin", "b.bin"]]
+    assert list(duplicates) == [hashlib.sha256(data).hexdigest()]
+    assert finder.group_sizes == {hashlib.sha256(data).hexdigest(): size}
+
+@pytest.mark.parametrize("size", [SMALL_FILE_SIZE, SMALL_FILE_SIZE + 1])
+def test_same_size_different_content(finder, tmp_path, size):
+    """Test that files of equal size but different contents are not duplicates."""
+    files = []
+    for i in range(3):
+        (tmp_path / f"file{i}.bin").write_bytes(bytes([i]) * size)
+        files.append(tmp_path / f"file{i}.bin")
+
+    assert finder.find_duplicates(files) == {}
+
+def test_find_duplicates_without_file_stats(finder, tmp_path):
+    """Test that file sizes are read from disk when no stat results are given."""
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_bytes(b"content")
+    (tmp_path / "c.txt").write_bytes(b"other")
+    files = sorted(tmp_path.iterdir())
+
+    assert _groups(finder.find_duplicates(files, file_stats=None)) == [["a.txt", "b.txt"]]
+    assert _groups(finder.find_duplicates(files, file_stats={})) == [["a.txt", "b.txt"]]
+
+def test_find_duplicates_reuses_file_stats(finder, tmp_path, monkeypatch):
+    """Test that given stat results are used instead of stat'ing files again."""
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_bytes(b"content")
+    files = sorted(tmp_path.iterdir())
+    file_stats = {file: file.stat() for file in files}
+
+    def no_stat(path):
+        raise AssertionError(f"{path} stat'ed again")
+    monkeypatch.setattr(os.path, "getsize", no_stat)
+    assert _groups(finder.find_duplicates(files, file_stats)) == [["a.txt", "b.txt"]]
+
+def test_min_size(tmp_path):
+    """Test that files smaller than the minimum size are ignored."""
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_bytes(b"abc")
+    files = sorted(tmp_path.iterdir())
+
+    assert DuplicateFinder(min_size=4).find_duplicates(files) == {}
+    assert len(DuplicateFinder(min_size=3).find_duplicates(files)) == 1
@@ -1,7 +1,5 @@
 """Tests for interactive file operations."""
 import os
-import tempfile
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 import pytest
 from filetree.interactive.actions import (
@@ -12,51 +10,43 @@ from filetree.interactive.actions import (
 )
 
 @pytest.fixture
-def test_files():
+def test_files(tmp_path):
     """Create a temporary directory with test files."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        root = Path(tmp_dir)
-        
-        # Create test files
-        (root / "file1.txt").write_text("content1")
-        (root / "file2.txt").write_text("content1")  # Duplicate
-        (root / "unique.txt").write_text("unique")
-        
-        # Create test directories
-        src_dir = root / "source"
-        src_dir.mkdir()
-        (src_dir / "test1.txt").write_text("test1")
-        (src_dir / "test2.txt").write_text("test2")
-        
-        target_dir = root / "target"
-        target_dir.mkdir()
-        (target_dir / "test3.txt").write_text("test3")
-        
-        yield root
+    root = tmp_path
+    
+    # Create test files
+    (root / "file1.txt").write_bytes(b"content1")
+    (root / "file2.txt").write_bytes(b"content1")  # Duplicate
+    (root / "unique.txt").write_bytes(b"unique")
+    
+    # Create test directories
+    src_dir = root / "source"
+    src_dir.mkdir()
+    (src_dir / "test1.txt").write_bytes(b"test1")
+    (src_dir / "test2.txt").write_bytes(b"test2")
+    
+    target_dir = root / "target"
+    target_dir.mkdir()
+    (target_dir / "test3.txt").write_bytes(b"test3")
+    
+    return root
 
-def test_file_action_confirm(monkeypatch):
+@pytest.mark.parametrize("answer,expected", [("y", True), ("n", False)])
+def test_file_action_confirm(monkeypatch, answer, expected):
     """Test FileAction confirmation."""
-    responses = iter(['y'])
-    monkeypatch.setattr('builtins.input', lambda *args: next(responses))
-    assert FileAction.confirm_action("Test?") is True
+    monkeypatch.setattr('builtins.input', lambda *args: answer)
+    assert FileAction.confirm_action("Test?") is expected
 
-    responses = iter(['n'])
-    monkeypatch.setattr('builtins.input', lambda *args: next(responses))
-    assert FileAction.confirm_action("Test?") is False
-
-def test_file_action_select_option(monkeypatch):
+@pytest.mark.parametrize("answers,expected", [
+    (['2'], "Option 2"),       # Valid selection
+    (['4', '1'], "Option 1"),  # Invalid then valid selection
+])
+def test_file_action_select_option(monkeypatch, answers, expected):
     """Test FileAction option selection."""
     options = ["Option 1", "Option 2", "Option 3"]
-
-    # Test valid selection
-    responses = iter(['2'])
-    monkeypatch.setattr('builtins.input', lambda *args: next(responses))
-    assert FileAction.select_option(options, "Choose:") == "Option 2"
-
-    # Test invalid then valid selection
-    responses = iter(['4', '1'])
+    responses = iter(answers)
     monkeypatch.setattr('builtins.input', lambda *args: next(responses))
-    assert FileAction.select_option(options, "Choose:") == "Option 1"
+    assert FileAction.select_option(options, "Choose:") == expected
 
 @patch('filetree.interactive.actions.console')
 def test_duplicate_resolver_show_duplicates(mock_console, test_files):
@@ -74,59 +64,86 @@ def test_duplicate_resolver_show_duplicates(mock_console, test_files):
     # Verify that console.print was called with a table
     assert mock_console.print.called
 
+def _answer(value):
+    """Build a replacement for a prompt method that always returns value."""
+    return staticmethod(lambda *args, **kwargs: value)
+
 @patch('filetree.interactive.actions.console')
-def test_duplicate_resolver_resolve_group(mock_console, test_files):
+def test_duplicate_resolver_resolve_group(mock_console, monkeypatch, test_files):
     """Test resolving a group of duplicate files."""
     paths = [
         test_files / "file1.txt",
         test_files / "file2.txt"
     ]
     
+    # Mock user selecting "Keep newest" option
+    monkeypatch.setattr(FileAction, 'select_option', _answer("Keep newest"))
+    monkeypatch.setattr(FileAction, 'confirm_action', _answer(True))
+    
     resolver = DuplicateResolver({})
+    resolver.resolve_group("hash1", paths)
     
-    # Mock user selecting "Keep newest" option
-    with patch.object(FileAction, 'select_option', return_value="Keep newest"):
-        with patch.object(FileAction, 'confirm_action', return_value=True):
-            resolver.resolve_group("hash1", paths)
-            
-            # Verify that one file was kept
-            assert sum(1 for p in paths if p.exists()) == 1
+    # Verify that one file was kept
+    assert sum(1 for p in paths if p.exists()) == 1
 
-def test_directory_manager_merge(test_files):
+def test_directory_manager_merge(monkeypatch, test_files):
     """Test merging directories."""
     source = test_files / "source"
     target = test_files / "target"
     
+    # Mock user confirmation
+    monkeypatch.setattr(FileAction, 'confirm_action', _answer(True))
+    
     manager = DirectoryManager()
+    manager.merge_directories(source, target)
     
-    # Mock user confirmation
-    with patch.object(FileAction, 'confirm_action', return_value=True):
-        manager.merge_directories(source, target)
-        
-        # Verify files were merged
-        assert (target / "test1.txt").exists()
-        assert (target / "test2.txt").exists()
-        assert (target / "test3.txt").exists()
-        assert not source.exists()  # Source should be removed
+    # Verify files were merged
+    assert (target / "test1.txt").exists()
+    assert (target / "test2.txt").exists()
+    assert (target / "test3.txt").exists()
+    assert not source.exists()  # Source should be removed
+
+def test_directory_manager_merge_nested(monkeypatch, test_files):
+    """Test merging into existing subdirectories and keeping declined files."""
+    source = test_files / "source"
+    target = test_files / "target"
+    (source / "sub").mkdir()
+    (source / "sub" / "nested.txt").write_bytes(b"nested")
+    (target / "sub").mkdir()
+    (source / "test3.txt").write_bytes(b"other")
+
+    # Confirm the merges but decline overwriting test3.txt
+    monkeypatch.setattr(
+        FileAction, 'confirm_action', staticmethod(lambda message: "Overwrite" not in message)
+    )
 
-def test_directory_manager_rename(test_files):
+    manager = DirectoryManager()
+    manager.merge_directories(source, target)
+
+    assert (target / "sub" / "nested.txt").exists()
+    assert not (source / "sub").exists()
+    assert (target / "test3.txt").read_bytes() == b"test3"
+    # The declined file is left behind, so the source is kept
+    assert (source / "test3.txt").exists()
+
+def test_directory_manager_rename(monkeypatch, test_files):
     """Test renaming files."""
     file_path = test_files / "file1.txt"
     new_name = "renamed.txt"
     
+    # Mock user input and confirmation
+    monkeypatch.setattr('rich.prompt.Prompt.ask', _answer(new_name))
+    monkeypatch.setattr(FileAction, 'confirm_action', _answer(True))
+    
     manager = DirectoryManager()
+    manager.rename_interactive(file_path)
     
-    # Mock user input and confirmation
-    with patch('rich.prompt.Prompt.ask', return_value=new_name):
-        with patch.object(FileAction, 'confirm_action', return_value=True):
-            manager.rename_interactive(file_path)
-            
-            # Verify file was renamed
-            assert not file_path.exists()
-            assert (file_path.parent / new_name).exists()
+    # Verify file was renamed
+    assert not file_path.exists()
+    assert (file_path.parent / new_name).exists()
 
 @patch('filetree.interactive.actions.console')
-def test_interactive_mode(mock_console, test_files):
+def test_interactive_mode(mock_console, monkeypatch, test_files):
     """Test interactive mode main loop."""
     duplicates = {
         "hash1": [
@@ -136,28 +153,28 @@ def test_interactive_mode(mock_console, test_files):
     }
     
     # Mock user selecting "Exit" option
-    with patch.object(FileAction, 'select_option', return_value="Exit"):
-        interactive_mode(duplicates)
-        
-        # Verify welcome and exit messages
-        mock_console.print.assert_any_call("[bold blue]Welcome to Interactive Mode[/bold blue]")
-        mock_console.print.assert_any_call("[bold blue]Exiting Interactive Mode[/bold blue]")
+    monkeypatch.setattr(FileAction, 'select_option', _answer("Exit"))
+    interactive_mode(duplicates)
+    
+    # Verify welcome and exit messages
+    mock_console.print.assert_any_call("[bold blue]Welcome to Interactive Mode[/bold blue]")
+    mock_console.print.assert_any_call("[bold blue]Exiting Interactive Mode[/bold blue]")
 
-def test_error_handling(test_files):
+def test_error_handling(monkeypatch, test_files):
     """Test error handling in interactive operations."""
     # Test non-existent source directory
     manager = DirectoryManager()
-    with patch.object(FileAction, 'confirm_action', return_value=True):
-        manager.merge_directories(
-            test_files / "nonexistent",
-            test_files / "target"
-        )
-        # Operation should fail gracefully
+    monkeypatch.setattr(FileAction, 'confirm_action', _answer(True))
+    manager.merge_directories(
+        test_files / "nonexistent",
+        test_files / "target"
+    )
+    # Operation should fail gracefully
         
     # Test renaming to existing file
     file_path = test_files / "file1.txt"
-    with patch('rich.prompt.Prompt.ask', return_value="file2.txt"):
-        with patch.object(FileAction, 'confirm_action', return_value=False):
-            manager.rename_interactive(file_path)
-            # Original file should still exist
-            assert file_path.exists() 
\ No newline at end of file
+    monkeypatch.setattr('rich.prompt.Prompt.ask', _answer("file2.txt"))
+    monkeypatch.setattr(FileAction, 'confirm_action', _answer(False))
+    manager.rename_interactive(file_path)
+    # Original file should still exist
+    assert file_path.exists()
\ No newline at end of file
@@ -1,9 +1,18 @@
 """Tests for parallel processing utilities."""
 import os
-import tempfile
+import sys
+import hashlib
+import socket
+import threading
 from pathlib import Path
 import pytest
-from filetree.utils.parallel import ParallelProcessor, compute_file_hash
+from filetree.utils.parallel import (
+    ParallelProcessor, compute_file_hash, LARGE_FILE_SIZE, HASH_BATCH_SIZE,
+    _small_file_digest, _kernel_file_digest
+)
+from filetree.utils import parallel
+from filetree.core.duplicates import HASH_CHUNK_SIZE
+from concurrent.futures.process import BrokenProcessPool
 from unittest.mock import patch, MagicMock
 
 @pytest.fixture
@@ -16,14 +25,183 @@ def test_processor_initialization():
     processor = ParallelProcessor(num_workers=4)
     assert processor.num_workers == 4
 
+def test_processor_default_workers():
+    """Test that the default worker count follows the CPUs available to the process."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count()
+    assert ParallelProcessor().num_workers == min(32, cpus * 2)
+
 def test_compute_file_hash(tmp_path):
     """Test computing file hash."""
     test_file = tmp_path / "test.txt"
-    test_file.write_text("test content")
+    test_file.write_bytes(b"test content")
     
     hash_value = compute_file_hash(test_file)
-    assert isinstance(hash_value, str)
-    assert len(hash_value) == 64  # SHA256 hash length
+    assert isinstance(hash_value, bytes)
+    assert len(hash_value) == 32  # SHA256 digest length
+
+def test_compute_file_hash_large_file(tmp_path):
+    """Test that large files hash to the same digest as hashlib."""
+    data = os.urandom(LARGE_FILE_SIZE + 12345)
+    test_file = tmp_path / "large.bin"
+    test_file.write_bytes(data)
+
+    assert compute_file_hash(test_file) == hashlib.sha256(data).digest()
+
+@pytest.mark.parametrize("size", [0, 1, HASH_CHUNK_SIZE, HASH_CHUNK_SIZE + 1])
+def test_compute_file_hash_chunk_boundary(tmp_path, size):
+    """Test files on either side of the single-read size limit."""
+    data = os.urandom(size)
+    test_file = tmp_path / "test.bin"
+    test_file.write_bytes(data)
+
+    assert compute_file_hash(test_file) == hashlib.sha256(data).digest()
+
+def test_small_file_digest_reads_bytes_untranslated(tmp_path):
+    """Test that line endings and ^Z survive the raw descriptor read."""
+    data = b"a\r\nb\x1a\r\n"
+    test_file = tmp_path / "crlf.txt"
+    test_file.write_bytes(data)
+
+    real_open = os.open
+    flags = []
+    def recording_open(path, flag, *args):
+        flags.append(flag)
+        return real_open(path, flag, *args)
+    with patch("os.open", side_effect=recording_open):
+        assert _small_file_digest(str(test_file)) == hashlib.sha256(data).digest()
+    binary = getattr(os, "O_BINARY", 0)
+    assert flags and all(flag & binary == binary for flag in flags)
+
+class _FakeHashSocket:
+    """Stand-in for an AF_ALG socket whose digest is a fixed byte string."""
+
+    def __init__(self, *args):
+        self.address = None
+        self.closed = False
+        self.op = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def bind(self, address):
+        self.address = address
+
+    def accept(self):
+        self.op = _FakeHashSocket()
+        return self.op, None
+
+    def fileno(self):
+        return -1
+
+    def recv(self, size):
+        return b"\xab" * size
+
+@pytest.fixture
+def fake_kernel_hash(monkeypatch):
+    """Stub out the kernel hash socket and splice, recording what they see."""
+    calls = {"sockets": [], "pipes": [], "spliced": 0, "fail": False}
+    def fake_socket(*args):
+        calls["sockets"].append(_FakeHashSocket())
+        return calls["sockets"][-1]
+    real_pipe = os.pipe
+    def recording_pipe():
+        fds = real_pipe()
+        calls["pipes"].extend(fds)
+        return fds
+    def fake_splice(src, dst, count, offset_src=None, flags=0):
+        if dst == -1:
+            if calls["fail"]:
+                raise OSError("splice failed")
+            calls["spliced"] += count
+        return count
+
+    monkeypatch.setattr(socket, "AF_ALG", getattr(socket, "AF_ALG", 38), raising=False)
+    monkeypatch.setattr(os, "SPLICE_F_MORE", getattr(os, "SPLICE_F_MORE", 4), raising=False)
+    monkeypatch.setattr(socket, "socket", fake_socket)
+    monkeypatch.setattr(os, "pipe", recording_pipe)
+    monkeypatch.setattr(os, "splice", fake_splice, raising=False)
+    monkeypatch.setattr(parallel, "_kernel_hash_available", True)
+    return calls
+
+def _assert_closed(calls):
+    """Check that every pipe and socket the kernel hash opened is closed."""
+    assert len(calls["pipes"]) == 2
+    for fd in calls["pipes"]:
+        with pytest.raises(OSError):
+            os.fstat(fd)
+    (alg,) = calls["sockets"]
+    assert alg.closed and alg.op.closed
+
+def test_kernel_file_digest(fake_kernel_hash, tmp_path):
+    """Test that the whole file is spliced into the hash socket and its digest returned."""
+    size = HASH_CHUNK_SIZE * 2 + 5
+    test_file = tmp_path / "large.bin"
+    test_file.write_bytes(b"x" * size)
+
+    with open(test_file, "rb") as f:
+        assert _kernel_file_digest(f.fileno(), size) == b"\xab" * 32
+    assert fake_kernel_hash["sockets"][0].address == ("hash", "sha256")
+    assert fake_kernel_hash["spliced"] == size
+    _assert_closed(fake_kernel_hash)
+
+def test_kernel_file_digest_error(fake_kernel_hash, tmp_path):
+    """Test that a failing splice closes everything and disables kernel hashing."""
+    fake_kernel_hash["fail"] = True
+    test_file = tmp_path / "large.bin"
+    test_file.write_bytes(b"x" * 100)
+
+    with open(test_file, "rb") as f:
+        assert _kernel_file_digest(f.fileno(), 100) is None
+    assert not parallel._kernel_hash_available
+    _assert_closed(fake_kernel_hash)
+
+def test_compute_file_hash_empty_file(tmp_path):
+    """Test that empty files get the digest of no data without being opened."""
+    test_file = tmp_path / "empty.txt"
+    test_file.touch()
+
+    opened = AssertionError("empty file opened")
+    with patch("builtins.open", side_effect=opened), patch("os.open", side_effect=opened):
+        assert compute_file_hash(test_file) == hashlib.sha256(b"").digest()
+
+def test_compute_file_hash_cache(tmp_path):
+    """Test that cached digests are reused until the file changes."""
+    test_file = tmp_path / "test.txt"
+    test_file.write_bytes(b"first")
+    first = compute_file_hash(test_file)
+
+    reread = AssertionError("file read again")
+    with patch("builtins.open", side_effect=reread), patch("os.open", side_effect=reread):
+        assert compute_file_hash(test_file) == first
+
+    test_file.write_bytes(b"other")
+    stat = test_file.stat()
+    os.utime(test_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert compute_file_hash(test_file) == hashlib.sha256(b"other").digest()
+
+    compute_file_hash.cache_clear()
+    assert compute_file_hash(test_file) == hashlib.sha256(b"other").digest()
+
+def test_processor_hash_algorithm():
+    """Test choosing the processor's hash algorithm."""
+    assert ParallelProcessor(num_workers=1, hash_algorithm="sha256").hash_algorithm == "sha256"
+    with pytest.raises(ValueError, match="Unsupported hash algorithm: md5"):
+        ParallelProcessor(num_workers=1, hash_algorithm="md5")
+
+def test_compute_file_hash_blake3(tmp_path):
+    """Test BLAKE3 hashing of small and large files."""
+    blake3 = pytest.importorskip("blake3")
+    for name, size in (("small.bin", 100), ("large.bin", LARGE_FILE_SIZE + 1)):
+        data = os.urandom(size)
+        test_file = tmp_path / name
+        test_file.write_bytes(data)
+        assert compute_file_hash(test_file, "blake3") == blake3.blake3(data).digest()
 
 def test_find_duplicates(processor, tmp_path):
     """Test finding duplicate files."""
@@ -32,9 +210,9 @@ def test_find_duplicates(processor, tmp_path):
     file2 = tmp_path / "file2.txt"
     file3 = tmp_path / "file3.txt"
     
-    file1.write_text("test content")
-    file2.write_text("test content")  # Duplicate of file1
-    file3.write_text("different content")
+    file1.write_bytes(b"test content")
+    file2.write_bytes(b"test content")  # Duplicate of file1
+    file3.write_bytes(b"different content")
     
     duplicates = processor.find_duplicates(tmp_path)
     assert len(duplicates) == 1  # One group of duplicates
@@ -48,6 +226,47 @@ def test_find_duplicates(processor, tmp_path):
     assert file2 in duplicate_files
     assert file3 not in duplicate_files
 
+def test_find_duplicates_hashes_only_same_size_files(processor, tmp_path):
+    """Test that files with a unique size are never hashed."""
+    (tmp_path / "a.txt").write_bytes(b"same")
+    (tmp_path / "b.txt").write_bytes(b"same")
+    (tmp_path / "c.txt").write_bytes(b"diff")
+    (tmp_path / "unique.txt").write_bytes(b"a longer file")
+
+    hashed = []
+    original = processor.compute_file_hash
+    def counting_hash(file_path):
+        hashed.append(Path(file_path).name)
+        return original(file_path)
+
+    with patch.object(processor, "compute_file_hash", side_effect=counting_hash):
+        duplicates = processor.find_duplicates(tmp_path)
+
+    assert sorted(hashed) == ["a.txt", "b.txt", "c.txt"]
+    assert [sorted(p.name for p in paths) for paths in duplicates.values()] == [["a.txt", "b.txt"]]
+
+def test_find_duplicates_skips_large_files_with_different_ends(processor, tmp_path):
+    """Test that large files differing in their first or last bytes are never hashed."""
+    data = os.urandom(HASH_CHUNK_SIZE * 2)
+    (tmp_path / "a.bin").write_bytes(data)
+    (tmp_path / "b.bin").write_bytes(data)
+    for name, offset in [("head.bin", 0), ("middle.bin", HASH_CHUNK_SIZE), ("tail.bin", -1)]:
+        changed = bytearray(data)
+        changed[offset] ^= 1
+        (tmp_path / name).write_bytes(changed)
+
+    hashed = []
+    original = processor.compute_file_hash
+    def counting_hash(file_path):
+        hashed.append(Path(file_path).name)
+        return original(file_path)
+
+    with patch.object(processor, "compute_file_hash", side_effect=counting_hash):
+        duplicates = processor.find_duplicates(tmp_path)
+
+    assert sorted(hashed) == ["a.bin", "b.bin", "middle.bin"]
+    assert [sorted(p.name for p in paths) for paths in duplicates.values()] == [["a.bin", "b.bin"]]
+
 def test_scan_directory(processor, tmp_path):
     """Test scanning directory."""
     # Create test files and directories
@@ -56,14 +275,41 @@ def test_scan_directory(processor, tmp_path):
     subdir.mkdir()
     file2 = subdir / "file2.txt"
     
-    file1.write_text("content1")
-    file2.write_text("content2")
+    file1.write_bytes(b"content1")
+    file2.write_bytes(b"content2")
     
     files = processor.scan_directory(tmp_path)
     assert len(files) == 2
     assert file1 in files
     assert file2 in files
 
+def test_scan_directory_lopsided_tree(processor, tmp_path):
+    """Test scanning a tree where a single subtree holds most files."""
+    deep = tmp_path
+    expected = set()
+    for depth in range(10):
+        deep = deep / f"level{depth}"
+        deep.mkdir()
+        for i in range(3):
+            file = deep / f"file{i}.txt"
+            file.write_text(f"{depth}-{i}")
+            expected.add(file)
+    (tmp_path / "empty").mkdir()
+
+    files = processor.scan_directory(tmp_path)
+    assert files == expected
+
+def test_iter_files_is_lazy(processor, tmp_path):
+    """Test that files are yielded lazily and early exit is safe."""
+    for i in range(50):
+        (tmp_path / f"file{i}.txt").write_text(f"content {i}")
+
+    files = processor.iter_files(tmp_path)
+    first = next(files)
+    assert isinstance(first, Path)
+    files.close()  # Abandoning the scan closes the underlying walk
+    assert next(files, None) is None
+
 def test_process_files(processor, tmp_path):
     """Test processing files in parallel."""
     # Create test files
@@ -79,10 +325,90 @@ def test_process_files(processor, tmp_path):
     # Verify results
     assert len(results) > 0  # Should have at least one hash
     for hash_value, paths in results.items():
-        assert isinstance(hash_value, str)
+        assert isinstance(hash_value, bytes)
         assert isinstance(paths, list)
         assert all(isinstance(p, Path) for p in paths)
 
+def test_process_files_many_batches(processor, tmp_path):
+    """Test that every file is grouped when hashing spans many batches."""
+    pairs = HASH_BATCH_SIZE * processor.num_workers * 2 + 3
+    files = []
+    for i in range(pairs):
+        for copy in ("a", "b"):
+            file = tmp_path / f"file{i}{copy}.txt"
+            file.write_text(f"content {i}")
+            files.append(file)
+
+    results = processor.process_files(iter(files))
+    assert len(results) == pairs
+    assert sorted(p for paths in results.values() for p in paths) == sorted(files)
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="worker processes need Linux")
+def test_find_duplicates_in_processes(processor, tmp_path, monkeypatch):
+    """Test that hashing in worker processes finds the same duplicates."""
+    monkeypatch.setattr("filetree.utils.parallel.PROCESS_HASH_MIN_FILES", 0)
+    monkeypatch.setattr("filetree.utils.parallel._AVAILABLE_CPUS", 2)
+    for i in range(3):
+        for copy in ("a", "b"):
+            (tmp_path / f"file{i}{copy}.txt").write_bytes(b"content %d" % i)
+    (tmp_path / "unique.txt").write_bytes(b"unique 0")
+
+    with patch.object(processor, "process_files", side_effect=AssertionError("used threads")):
+        duplicates = processor.find_duplicates(tmp_path)
+    assert sorted(sorted(p.name for p in paths) for paths in duplicates.values()) == [
+        [f"file{i}a.txt", f"file{i}b.txt"] for i in range(3)
+    ]
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="worker processes need Linux")
+def test_digests_from_processes_are_cached(processor, tmp_path, monkeypatch):
+    """Test that digests hashed in worker processes are cached in this one."""
+    monkeypatch.setattr("filetree.utils.parallel.PROCESS_HASH_MIN_FILES", 0)
+    monkeypatch.setattr("filetree.utils.parallel._AVAILABLE_CPUS", 2)
+    compute_file_hash.cache_clear()
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_bytes(b"content")
+    with patch.object(processor, "process_files", side_effect=AssertionError("used threads")):
+        processor.find_duplicates(tmp_path)
+
+    reread = AssertionError("file read again")
+    with patch("builtins.open", side_effect=reread), patch("os.open", side_effect=reread):
+        assert compute_file_hash(tmp_path / "a.txt") == hashlib.sha256(b"content").digest()
+
+def test_no_worker_processes_while_threads_run(processor, monkeypatch):
+    """Test that the process is never forked while another thread runs."""
+    monkeypatch.setattr("filetree.utils.parallel._AVAILABLE_CPUS", 2)
+    monkeypatch.setattr("filetree.utils.parallel.sys.platform", "linux")
+    assert processor._process_workers(10_000) == 2
+
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait)
+    thread.start()
+    try:
+        assert processor._process_workers(10_000) == 0
+    finally:
+        release.set()
+        thread.join()
+
+@pytest.mark.parametrize("error",[BrokenProcessPool("worker died"), OSError("no fork")])
+def test_find_duplicates_when_processes_fail(processor, tmp_path, monkeypatch, error):
+    """Test that files are hashed in threads when the process pool fails."""
+    monkeypatch.setattr("filetree.utils.parallel.PROCESS_HASH_MIN_FILES", 0)
+    monkeypatch.setattr("filetree.utils.parallel._AVAILABLE_CPUS", 2)
+    monkeypatch.setattr("filetree.utils.parallel.sys.platform", "linux")
+    monkeypatch.setattr("filetree.utils.parallel.ProcessPoolExecutor", MagicMock(side_effect=error))
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_bytes(b"content")
+
+    duplicates = processor.find_duplicates(tmp_path)
+    assert [sorted(p.name for p in paths) for paths in duplicates.values()] == [["a.txt", "b.txt"]]
+
+@pytest.mark.parametrize("platform", ["darwin", "win32"])
+def test_no_worker_processes_outside_linux(processor, monkeypatch, platform):
+    """Test that files are never hashed in forked processes outside Linux."""
+    monkeypatch.setattr("filetree.utils.parallel._AVAILABLE_CPUS", 2)
+    monkeypatch.setattr("filetree.utils.parallel.sys.platform", platform)
+    assert processor._process_workers(10_000) == 0
+
 def test_error_handling(processor):
     """Test error handling in parallel processor."""
     # Test with empty set of files
@@ -0,0 +1,90 @@
+"""Tests for the report generation module."""
+import io
+import pytest
+from filetree.core.scanner import FileTreeScanner
+from filetree.utils.config import Config
+from filetree.utils.report import ReportGenerator
+
+@pytest.fixture
+def generator():
+    """Create a report generator instance for testing."""
+    return ReportGenerator()
+
+@pytest.fixture
+def sized_tree(tmp_path):
+    """Create a directory with files of 100, 200 and 300 bytes."""
+    for name, size in (("a.txt", 100), ("b.txt", 200), ("c.txt", 300)):
+        (tmp_path / name).write_bytes(b"x" * size)
+    return tmp_path
+
+@pytest.mark.parametrize("size,expected", [
+    (0, "0.0 B"),
+    (1, "1.0 B"),
+    (1023, "1023.0 B"),
+    (1024, "1.0 KB"),
+    (1536, "1.5 KB"),
+    (1024 ** 2 - 1, "1024.0 KB"),
+    (1024 ** 2, "1.0 MB"),
+    (1024 ** 3, "1.0 GB"),
+    (1024 ** 4, "1.0 TB"),
+    (1024 ** 5, "1.0 PB"),
+    (1024 ** 6, "1024.0 PB"),
+    (1.5e6, "1.4 MB"),
+    (512.5, "512.5 B"),
+    (-5, "-5.0 B"),
+])
+def test_format_size(generator, size, expected):
+    """Test sizes at and around unit boundaries, past the largest unit, and floats."""
+    assert generator._format_size(size) == expected
+
+def _summary_size(report: str) -> str:
+    """Get the total size given in a report's summary."""
+    return next(line for line in report.splitlines() if line.startswith("- Total Size:"))
+
+def test_summary_size_counts_reported_files_only(generator, sized_tree):
+    """Test that the total size covers the files reported, not every cached stat."""
+    scanner = FileTreeScanner(Config())
+    files = sorted(scanner.scan_directory(sized_tree))
+
+    report = generator.generate_report(
+        sized_tree, files[:2], {}, Config(), file_stats=scanner.file_stats
+    )
+    assert _summary_size(report) == "- Total Size: 300.0 B"
+
+def test_summary_size_without_scan_stats(generator, sized_tree):
+    """Test that files missing from the stat cache are stat'ed for the total size."""
+    scanner = FileTreeScanner(Config())
+    files = scanner.scan_directory(sized_tree, stat_files=False)
+
+    report = generator.generate_report(
+        sized_tree, files, {}, Config(), file_stats=scanner.file_stats
+    )
+    assert _summary_size(report) == "- Total Size: 600.0 B"
+
+def test_duplicate_group_size_without_scan_stats(generator, sized_tree):
+    """Test that duplicate groups are sized by stat when the scan kept no stats."""
+    (sized_tree / "copy.txt").write_bytes(b"x" * 100)
+    scanner = FileTreeScanner(Config())
+    files = scanner.scan_directory(sized_tree, stat_files=False)
+    duplicates = {"hash1": [sized_tree / "a.txt", sized_tree / "copy.txt"]}
+
+    report = generator.generate_report(
+        sized_tree, files, duplicates, Config(), file_stats=scanner.file_stats
+    )
+    assert "### Group (100.0 B each)" in report
+
+def test_generate_report_to_stream(generator, sized_tree):
+    """Test that the report is written to a given stream instead of returned."""
+    scanner = FileTreeScanner(Config())
+    files = scanner.scan_directory(sized_tree)
+    expected = generator.generate_report(
+        sized_tree, files, {}, Config(), file_stats=scanner.file_stats
+    )
+
+    out = io.StringIO()
+    out.write("preamble\n")
+    result = generator.generate_report(
+        sized_tree, files, {}, Config(), file_stats=scanner.file_stats, out=out
+    )
+    assert result is None
+    assert out.getvalue() == "preamble\n" + expected
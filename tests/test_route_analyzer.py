@@ -1,3 +1,4 @@
+import os
 import pytest
 from pathlib import Path
 from filetree.core.route_analyzer import RouteAnalyzer
@@ -43,4 +44,45 @@ def test_path_normalization(test_directory):
         "src\\utils\\helpers",
         "src/utils/common"
     )
-    assert similarity > 0.6  # First two components match
\ No newline at end of file
+    assert similarity > 0.6  # First two components match
+
+def test_identical_routes(test_directory):
+    """Test that a route is fully similar to itself and never to an empty one."""
+    analyzer = RouteAnalyzer(test_directory)
+    assert analyzer._compute_similarity("src/utils", "src/utils") == 1.0
+    assert analyzer._compute_similarity("src/utils", "") == 0.0
+
+@pytest.mark.parametrize("threshold", [0.0, 0.3, 0.5, 0.75, 1.0])
+def test_similar_routes_match_full_comparison(tmp_path, threshold):
+    """Test that only skipping unrelated routes gives the pairwise result."""
+    for route in ["a/b/c/d", "a/b/c/e", "a/x/c/d", "q/b/c/d", "z/y/w", "z/y", "a/b/q/r/s"]:
+        (tmp_path / route).mkdir(parents=True, exist_ok=True)
+
+    analyzer = RouteAnalyzer(tmp_path, similarity_threshold=threshold)
+    similar_routes = analyzer.find_similar_routes()
+
+    routes = analyzer.routes
+    expected = []
+    for i, route1 in enumerate(routes):
+        for route2 in routes[i + 1:]:
+            similarity = analyzer._compute_similarity(route1, route2)
+            if similarity >= threshold:
+                expected.append((route1, route2, similarity))
+    assert similar_routes == expected
+
+def test_routes_match_rglob(test_directory):
+    """Test that the routes are rglob's directories, listed in a fixed order."""
+    (test_directory / "src" / "core" / "deep").mkdir()
+    (test_directory / "src" / "file.txt").write_text("not a route")
+    analyzer = RouteAnalyzer(test_directory)
+    analyzer.find_similar_routes()
+
+    expected = {str(p.relative_to(test_directory)) for p in test_directory.rglob("*") if p.is_dir()}
+    assert set(analyzer.routes) == expected
+    assert analyzer.routes == [route.replace("/", os.sep) for route in [
+        "lib", "src", "test",
+        "lib/utils",
+        "src/core", "src/utils",
+        "src/core/deep",
+        "test/utils",
+    ]]
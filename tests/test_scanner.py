@@ -1,9 +1,9 @@
 """Tests for the file scanner module."""
 import os
-import tempfile
 from pathlib import Path
 import pytest
-from filetree.core.scanner import FileTreeScanner
+from fnmatch import fnmatch
+from filetree.core.scanner import FileTreeScanner, _compile_ignore_patterns
 from filetree.utils.config import Config
 
 @pytest.fixture
@@ -12,32 +12,41 @@ def scanner():
     config = Config()
     return FileTreeScanner(config)
 
-@pytest.fixture
-def test_directory():
-    """Create a test directory with various files."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        root = Path(tmp_dir)
-        
-        # Create regular files
-        (root / "file1.txt").write_text("content1")
-        (root / "file2.py").write_text("content2")
-        
-        # Create hidden files
-        (root / ".hidden").write_text("hidden")
-        
-        # Create subdirectory with files
-        subdir = root / "subdir"
-        subdir.mkdir()
-        (subdir / "file3.txt").write_text("content3")
-        (subdir / "file4.py").write_text("content4")
+def _build_test_directory(root: Path) -> Path:
+    """Create a test directory with various files under root."""
+    # Create regular files
+    (root / "file1.txt").write_bytes(b"content1")
+    (root / "file2.py").write_bytes(b"content2")
+    
+    # Create hidden files
+    (root / ".hidden").write_bytes(b"hidden")
+    
+    # Create subdirectory with files
+    subdir = root / "subdir"
+    subdir.mkdir()
+    (subdir / "file3.txt").write_bytes(b"content3")
+    (subdir / "file4.py").write_bytes(b"content4")
+    
+    # Create symlink if supported
+    try:
+        (root / "link.txt").symlink_to(root / "file1.txt")
+    except OSError:
+        pass  # Symlinks might not be supported
         
-        # Create symlink if supported
-        try:
-            (root / "link.txt").symlink_to(root / "file1.txt")
-        except OSError:
-            pass  # Symlinks might not be supported
-            
-        yield root
+    return root
+
+@pytest.fixture(scope="session")
+def test_directory(tmp_path_factory):
+    """Create a test directory with various files, shared by the session.
+
+    Tests must not modify it; those that do use writable_test_directory.
+    """
+    return _build_test_directory(tmp_path_factory.mktemp("scanner"))
+
+@pytest.fixture
+def writable_test_directory(tmp_path):
+    """Create a test directory with various files for a single test."""
+    return _build_test_directory(tmp_path)
 
 def test_scanner_initialization():
     """Test scanner initialization."""
@@ -49,21 +58,21 @@ def test_scan_directory(scanner, test_directory):
     """Test scanning directory."""
     files = scanner.scan_directory(test_directory)
     
-    # Get list of file names for debugging
-    file_names = [f.name for f in files]
+    # Collect file names once for the checks and for debugging
+    file_names = {f.name for f in files}
     
     # Should find all non-hidden files
-    assert len(files) == 4, f"Expected 4 files but found {len(files)}: {file_names}"
-    assert any(f.name == "file1.txt" for f in files)
-    assert any(f.name == "file2.py" for f in files)
-    assert any(f.name == "file3.txt" for f in files)
-    assert any(f.name == "file4.py" for f in files)
+    assert len(files) == 4, f"Expected 4 files but found {len(files)}: {sorted(file_names)}"
+    assert "file1.txt" in file_names
+    assert "file2.py" in file_names
+    assert "file3.txt" in file_names
+    assert "file4.py" in file_names
     
     # Should not include hidden files by default
-    assert not any(f.name == ".hidden" for f in files)
+    assert ".hidden" not in file_names
     
     # Should not include symlinks by default
-    assert not any(f.name == "link.txt" for f in files)
+    assert "link.txt" not in file_names
 
 def test_scan_with_hidden_files(test_directory):
     """Test scanning with hidden files included."""
@@ -87,15 +96,75 @@ def test_scan_with_symlinks(test_directory):
     else:
         pytest.skip("Symlinks not supported on this platform")
 
+def test_scan_skips_symlinked_directories(scanner, writable_test_directory):
+    """Test that symlinked directories are neither descended into nor listed."""
+    try:
+        (writable_test_directory / "linkdir").symlink_to(writable_test_directory / "subdir")
+    except OSError:
+        pytest.skip("Symlinks not supported on this platform")
+
+    files = scanner.scan_directory(writable_test_directory)
+    assert not any("linkdir" in f.parts for f in files)
+    assert len(files) == 4
+
 def test_scan_with_ignore_patterns(test_directory):
     """Test scanning with ignore patterns."""
     config = Config()
     config.ignore_patterns.append("*.py")
     scanner = FileTreeScanner(config)
     
-    files = scanner.scan_directory(test_directory)
-    assert not any(f.suffix == ".py" for f in files)
-    assert any(f.suffix == ".txt" for f in files)
+    suffixes = {f.suffix for f in scanner.scan_directory(test_directory)}
+    assert ".py" not in suffixes
+    assert ".txt" in suffixes
+
+def test_ignore_patterns_changed_between_scans(scanner, test_directory):
+    """Test that patterns added after a scan apply to the next one."""
+    assert any(f.suffix == ".py" for f in scanner.scan_directory(test_directory))
+
+    scanner.config.ignore_patterns.append("*.py")
+    assert not any(f.suffix == ".py" for f in scanner.scan_directory(test_directory))
+
+@pytest.mark.parametrize("patterns", [
+    ("*.pyc", "node_modules", "*.tar.gz"),
+    ("test_*", "data?.csv", "[ab].txt"),
+    ("*.pyc", "build", "*~", "cache*"),
+    (),
+])
+def test_compile_ignore_patterns_matches_fnmatch(patterns):
+    """Test that literal, suffix and glob patterns match as fnmatch does."""
+    ignore_match = _compile_ignore_patterns(patterns)
+    for name in ["a.pyc", ".pyc", "a.pyc.bak", "node_modules", "node_modules2",
+                 "x.tar.gz", "test_a.py", "data1.csv", "data10.csv", "a.txt",
+                 "c.txt", "build", "notes~", "cache_dir", "plain"]:
+        assert ignore_match(name) == any(fnmatch(name, p) for p in patterns), name
+
+def test_scan_skips_contents_of_ignored_directories(scanner, writable_test_directory):
+    """Test that nothing below an ignored or hidden directory is scanned."""
+    nested = writable_test_directory / "node_modules" / "pkg"
+    nested.mkdir(parents=True)
+    (nested / "index.js").write_bytes(b"module")
+    hidden_nested = writable_test_directory / ".cache" / "deep"
+    hidden_nested.mkdir(parents=True)
+    (hidden_nested / "data.txt").write_bytes(b"cached")
+
+    files = scanner.scan_directory(writable_test_directory)
+    names = {f.name for f in files}
+    assert "index.js" not in names
+    assert "data.txt" not in names
+
+def test_parallel_scan_matches_sequential(scanner, writable_test_directory, monkeypatch):
+    """Test that listing directories in threads returns the same scan."""
+    for sub in ("a/b/c", "a/d", "e"):
+        (writable_test_directory / sub).mkdir(parents=True)
+        (writable_test_directory / sub / "data.txt").write_bytes(sub.encode())
+
+    monkeypatch.setattr("filetree.core.scanner.SCAN_WORKERS", 1)
+    sequential = scanner.scan_directory(writable_test_directory)
+    sequential_stats = scanner.file_stats
+
+    monkeypatch.setattr("filetree.core.scanner.SCAN_WORKERS", 4)
+    assert scanner.scan_directory(writable_test_directory) == sequential
+    assert scanner.file_stats == sequential_stats
 
 def test_get_file_stats(scanner, test_directory):
     """Test getting file statistics."""
@@ -107,6 +176,33 @@ def test_get_file_stats(scanner, test_directory):
     assert stats['min_size'] > 0
     assert stats['max_size'] >= stats['min_size']
 
+def test_scan_records_file_stats(scanner, test_directory):
+    """Test that scanning keeps a stat result for every file found."""
+    files = scanner.scan_directory(test_directory)
+
+    assert set(scanner.file_stats) == set(files)
+    for file in files:
+        assert scanner.file_stats[file].st_size == file.stat().st_size
+
+def test_scan_without_file_stats(scanner, test_directory):
+    """Test that a scan without stat calls finds the same files and stats them on demand."""
+    files = scanner.scan_directory(test_directory)
+    expected = scanner.get_file_stats(files)
+
+    assert scanner.scan_directory(test_directory, stat_files=False) == files
+    assert scanner.file_stats == {}
+    assert scanner.get_file_stats(files) == expected
+
+def test_get_file_stats_reuses_scan(scanner, test_directory, monkeypatch):
+    """Test that file statistics use the sizes recorded by the scan."""
+    files = scanner.scan_directory(test_directory)
+    expected = sum(f.stat().st_size for f in files)
+
+    def no_stat(path):
+        raise AssertionError(f"{path} stat'ed again")
+    monkeypatch.setattr(os.path, "getsize", no_stat)
+    assert scanner.get_file_stats(files)['total_size'] == expected
+
 def test_get_file_types(scanner, test_directory):
     """Test getting file type distribution."""
     files = scanner.scan_directory(test_directory)
@@ -117,21 +213,47 @@ def test_get_file_types(scanner, test_directory):
     assert type_dist[".txt"] == 2
     assert type_dist[".py"] == 2
 
+def test_get_file_types_folds_case():
+    """Test that suffixes differing only in case are counted together, in first-seen order."""
+    files = [Path("a.PY"), Path("b.txt"), Path("c"), Path("d.py"), Path("e.Txt"), Path(".rc")]
+    type_dist = FileTreeScanner.get_file_types(files)
+
+    assert list(type_dist.items()) == [(".py", 2), (".txt", 2), ("(no extension)", 2)]
+
+def test_scan_records_type_counts(scanner, test_directory):
+    """Test that scanning counts files per extension."""
+    files = scanner.scan_directory(test_directory)
+
+    assert scanner.type_counts == scanner.get_file_types(files)
+
 def test_get_directory_structure(scanner, test_directory):
     """Test getting directory structure."""
     structure = scanner.get_directory_structure(test_directory)
     
     # Root directory files
     assert "." in structure
-    root_files = structure["."]
-    assert any(f.name == "file1.txt" for f in root_files)
-    assert any(f.name == "file2.py" for f in root_files)
+    root_names = {f.name for f in structure["."]}
+    assert "file1.txt" in root_names
+    assert "file2.py" in root_names
     
     # Subdirectory files
     assert "subdir" in structure
-    subdir_files = structure["subdir"]
-    assert any(f.name == "file3.txt" for f in subdir_files)
-    assert any(f.name == "file4.py" for f in subdir_files)
+    subdir_names = {f.name for f in structure["subdir"]}
+    assert "file3.txt" in subdir_names
+    assert "file4.py" in subdir_names
+
+def test_scan_records_directory_structure(scanner, writable_test_directory):
+    """Test that scanning groups files by directory like get_directory_structure."""
+    (writable_test_directory / "subdir" / "nested").mkdir()
+    (writable_test_directory / "subdir" / "nested" / "deep.txt").write_bytes(b"deep")
+    (writable_test_directory / "empty").mkdir()
+
+    files = scanner.scan_directory(writable_test_directory)
+    expected = {}
+    for file in files:
+        expected.setdefault(str(file.parent.relative_to(writable_test_directory)), set()).add(file)
+    assert scanner.directory_structure == expected
+    assert scanner.get_directory_structure(writable_test_directory) == expected
 
 def test_scanner_error_handling(scanner):
     """Test error handling in scanner."""
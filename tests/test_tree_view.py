@@ -1,3 +1,6 @@
+import inspect
+import json
+import sys
 import pytest
 from pathlib import Path
 from rich.tree import Tree
@@ -16,20 +19,34 @@ def test_create_tree(visualizer, tmp_path):
     subdir.mkdir()
     file2 = subdir / "file2.txt"
     
-    file1.write_text("content1")
-    file2.write_text("content2")
+    file1.write_bytes(b"content1")
+    file2.write_bytes(b"content2")
     
     tree = visualizer.create_tree(tmp_path)
     assert isinstance(tree, Tree)
     assert tree.label == f"[bold blue]{tmp_path.name}[/bold blue]"
 
+def test_tree_nodes_match_tree_add(visualizer, tmp_path):
+    """Test that nodes get the same settings as nodes added with Tree.add."""
+    (tmp_path / "subdir").mkdir()
+    (tmp_path / "subdir" / "file.txt").write_bytes(b"content")
+
+    tree = visualizer.create_tree(tmp_path)
+    reference = Tree("root").add("reference")
+    subdir = tree.children[0]
+    for node in (subdir, subdir.children[0]):
+        assert (node.style, node.guide_style, node.expanded, node.highlight) == (
+            reference.style, reference.guide_style, reference.expanded, reference.highlight
+        )
+    assert subdir.children[0].label == "file.txt"
+
 def test_tree_with_duplicates(visualizer, tmp_path):
     """Test tree visualization with duplicate files."""
     # Create test files
     file1 = tmp_path / "file1.txt"
     file2 = tmp_path / "file2.txt"
-    file1.write_text("test content")
-    file2.write_text("test content")
+    file1.write_bytes(b"test content")
+    file2.write_bytes(b"test content")
     
     duplicates = {
         "hash1": [file1, file2]
@@ -40,11 +57,65 @@ def test_tree_with_duplicates(visualizer, tmp_path):
     # Verify that duplicate files are marked in red
     assert any("[red]" in str(node.label) for node in tree.children)
 
+def test_tree_duplicates_matched_by_directory(visualizer, tmp_path):
+    """Test that only the duplicate file itself is marked, not a namesake."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    for directory in ("a", "b"):
+        (tmp_path / directory / "same.txt").write_bytes(b"content")
+
+    tree = visualizer.create_tree(tmp_path, {"hash1": [tmp_path / "b" / "same.txt"]})
+    a, b = tree.children
+    assert a.children[0].label == "same.txt"
+    assert b.children[0].label == "[red]same.txt[/red]"
+
+def test_tree_duplicates_relative_and_absolute(visualizer, tmp_path, monkeypatch):
+    """Test that duplicates are matched whether paths are given relative or absolute."""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "dup.txt").write_bytes(b"content")
+    monkeypatch.chdir(tmp_path)
+
+    relative_root = visualizer.create_tree(Path("."), {"hash1": [tmp_path / "sub" / "dup.txt"]})
+    absolute_root = visualizer.create_tree(tmp_path, {"hash1": [Path("sub/dup.txt")]})
+    for tree in (relative_root, absolute_root):
+        assert tree.children[0].children[0].label == "[red]dup.txt[/red]"
+
+def test_export_results(visualizer, tmp_path):
+    """Test exporting duplicate groups to JSON."""
+    file1 = tmp_path / "file1.txt"
+    file2 = tmp_path / "file2.txt"
+    file1.write_bytes(b"test content")
+    file2.write_bytes(b"test content")
+    export_path = tmp_path / "results.json"
+
+    visualizer.export_results({"hash1": [file1, file2], "hash2": []}, export_path)
+
+    data = json.loads(export_path.read_text())
+    assert data == {
+        "hash1": [str(file1), str(file2)],
+        "hash2": [],
+        "summary": {
+            "total_groups": 2,
+            "total_duplicates": 0,
+            "total_wasted_space": len("test content")
+        }
+    }
+
+def test_export_results_with_group_sizes(visualizer, tmp_path):
+    """Test that known group sizes are used instead of stat'ing files."""
+    export_path = tmp_path / "results.json"
+    missing = [tmp_path / "gone1.txt", tmp_path / "gone2.txt", tmp_path / "gone3.txt"]
+
+    visualizer.export_results({"hash1": missing}, export_path, size_by_hash={"hash1": 100})
+
+    data = json.loads(export_path.read_text())
+    assert data["summary"]["total_wasted_space"] == 200
+
 def test_tree_with_symlinks(visualizer, tmp_path):
     """Test tree visualization with symlinks."""
     # Create test files
     file1 = tmp_path / "file1.txt"
-    file1.write_text("test content")
+    file1.write_bytes(b"test content")
     link1 = tmp_path / "link1.txt"
     
     try:
@@ -61,13 +132,36 @@ def test_tree_with_permission_error(visualizer, tmp_path):
     subdir = tmp_path / "subdir"
     subdir.mkdir()
     
-    def mock_iterdir(*args):
+    def mock_scandir(*args):
         raise PermissionError("Access denied")
     
-    # Mock the iterdir method to raise PermissionError
+    # Mock the scandir function to raise PermissionError
     with pytest.MonkeyPatch().context() as m:
-        m.setattr(Path, "iterdir", mock_iterdir)
+        m.setattr("filetree.visualization.tree_view.os.scandir", mock_scandir)
         tree = visualizer.create_tree(tmp_path)
         assert isinstance(tree, Tree)
         # Verify that permission error is shown in yellow
-        assert any("[yellow]Permission denied[/yellow]" in str(node.label) for node in tree.children)
\ No newline at end of file
+        assert any("[yellow]Permission denied[/yellow]" in str(node.label) for node in tree.children)
+
+def test_tree_deeper_than_recursion_limit(visualizer, tmp_path):
+    """Test that deep trees are built without recursing per directory."""
+    depth = 200
+    deepest = tmp_path
+    for _ in range(depth):
+        deepest = deepest / "d"
+        deepest.mkdir()
+
+    # Leave far fewer frames available than there are directory levels
+    original_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 50)
+    try:
+        tree = visualizer.create_tree(tmp_path)
+    finally:
+        sys.setrecursionlimit(original_limit)
+
+    levels = 0
+    node = tree
+    while node.children:
+        node = node.children[0]
+        levels += 1
+    assert levels == depth